@@ -1,53 +1,103 @@
 #!/usr/bin/env python3
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+import fcntl
+from functools import lru_cache
 import os
 import re
-import time
 from datetime import datetime
 import sys
 import hashlib
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+try:
+    # lxml's C parser is faster, fall back to the standard library
+    from lxml.etree import iterparse
+except ImportError:
+    from xml.etree.ElementTree import iterparse
+
 
 def write_log(msg):
-    time_prefix = datetime.strftime(datetime.now(), '%Y-%m-%d %H:%M:%S.%f')
-    time_prefix = time_prefix[:-3] + '$ '
-    print(time_prefix + msg)
+    time_prefix = datetime.now().isoformat(sep=' ', timespec='milliseconds')
+    print(f"{time_prefix}$ {msg}")
+
+
+# syncthing may resolve a conflict itself before we get to delete it; the
+# context manager is stateless, so one instance is shared by all removals
+ignore_missing = suppress(FileNotFoundError)
+
+
+def remove_conflict(conflict):
+    with ignore_missing:
+        os.remove(conflict)
+        write_log(f"Deleted {conflict}")
+
+
+def delete_conflicts(folder, match):
+    # iterate through all files in folder recursively; scandir exposes the
+    # entry type from readdir so no extra stat() is needed per file
+    stack = [folder]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif match(entry.name):
+                    # the full path is only needed for matching names
+                    remove_conflict(entry.path)
+
+
+class ConflictHandler(FileSystemEventHandler):
+    # delete conflict files as soon as syncthing creates or renames them
+    def __init__(self, match):
+        super().__init__()
+        self.match = match
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.delete(event.src_path)
 
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.delete(event.dest_path)
 
-def delete_conflicts(folder, conflict_marker):
-    # iterate through all files in folder recursively
-    for root, _, files in os.walk(folder):
-        for file in files:
-            if 'sync-conflict' in file and conflict_marker in file:
-                conflict = os.path.join(root, file)
-                write_log(f"Deleting {conflict}")
-                os.remove(conflict)
+    def delete(self, path):
+        if self.match(os.path.basename(path)):
+            remove_conflict(path)
 
+
+@lru_cache(maxsize=1)
 def get_pidfile_path():
-    hashed_path = hashlib.sha256(os.getcwd().encode('utf-8')).hexdigest()
-    hashed_path = os.path.join('/tmp', 'watch-conflict-' + hashed_path[:6] + '.pid')
+    hashed_path = hashlib.blake2b(
+        os.getcwd().encode('utf-8'), digest_size=3).hexdigest()
+    hashed_path = os.path.join('/tmp', 'watch-conflict-' + hashed_path + '.pid')
     return hashed_path
 
 
+def get_device_id(config_path):
+    # stream config.xml and stop at the first device of the <defaults> tag
+    in_defaults = False
+    for event, elem in iterparse(config_path, events=('start', 'end')):
+        if elem.tag == 'defaults':
+            in_defaults = event == 'start'
+        elif in_defaults and event == 'start' and elem.tag == 'device' \
+                and elem.get('id') and elem.get('introducedBy') == '':
+            return elem.get('id')
+    return None
+
+
 def watcher(targets):
-    # create pid file
-    pid = str(os.getpid())
-    pidfile = get_pidfile_path()
-    with open(pidfile, 'w') as f:
-        f.write(pid)
     config_path = os.path.expanduser('~/.config/syncthing/config.xml')
     if not os.path.exists(config_path):
         write_log("Config file not found")
         return
-    with open(config_path, 'r', encoding="utf-8") as f:
-        config = f.read()
-
-    # find content of  <defaults> tag
-    defaults = re.search(r'<defaults>(.*)</defaults>', config, re.DOTALL)
-    # find device id in <device> tag
-    device_id = re.search(
-        r'<device id="(.*)" introducedBy="">', defaults.group(1))
-    device_id = device_id.group(1)
+    device_id = get_device_id(config_path)
+    if device_id is None:
+        write_log("Device id not found")
+        return
     conflict_marker = device_id[:7]
+    match = re.compile(r'sync-conflict.*' + re.escape(conflict_marker)).search
     root = os.getcwd()
     if len(targets) == 0:
         folders = [root]
@@ -60,31 +110,51 @@ def watcher(targets):
         return
     for folder in folders:
         write_log(f"Watching folder {folder} with marker {conflict_marker}")
+    # delete conflicts created while the watcher was not running; the
+    # sweep is I/O bound so several folders are scanned concurrently
+    if len(folders) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(folders))) as pool:
+            list(pool.map(lambda folder: delete_conflicts(folder, match),
+                          folders))
+    else:
+        delete_conflicts(folders[0], match)
+    # then react to new files through inotify instead of rescanning
+    observer = Observer()
+    handler = ConflictHandler(match)
+    for folder in folders:
+        observer.schedule(handler, folder, recursive=True)
+    observer.start()
     write_log("Press Ctrl + C to exit")
-    interval = 5  # unit: mins
     try:
-        while True:
-            # delete all files with conflict marker
-            for folder in folders:
-                delete_conflicts(folder, conflict_marker)
-            # sleep for 5 mins
-            time.sleep(interval * 60)
+        # block until the observer stops; Ctrl + C interrupts the join
+        observer.join()
     except KeyboardInterrupt:
         write_log("Exiting...")
+    finally:
+        observer.stop()
+        observer.join()
+
+
+# descriptor of the locked pid file, kept open for the process lifetime
+pidfile_fd = None
+
 
 def only_intance():
-    # check if another instance is running
-    pidfile = get_pidfile_path()
-    # pid = str(os.getpid())
-    # pidfile = "/tmp/watch-conflict.pid"
-    if os.path.isfile(pidfile):
-        with open(pidfile, 'r') as f:
-            pid = f.read()
-        if os.path.exists(f"/proc/{pid}"):
-            return True
-        else:
-            os.remove(pidfile)
-            return False
+    # check if another instance is running; the kernel releases the lock
+    # when the holder exits, so a stale pid file never blocks a new start
+    global pidfile_fd
+    fd = os.open(get_pidfile_path(), os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return True
+    # overwrite in place, then trim, so the file is never seen empty
+    pid = str(os.getpid()).encode()
+    os.pwrite(fd, pid, 0)
+    os.ftruncate(fd, len(pid))
+    pidfile_fd = fd
+    return False
 
 
 if __name__ == "__main__":
@@ -9,6 +9,54 @@ from streamlit_extras.switch_page_button import switch_page
 from optimizer.gpt.api import get_default_mode
 from optimizer.utils.format import custom_layout
 
+# layout options of the Streamlit app, the first one is the default
+_LAYOUTS = ("centered", "wide")
+
+# session_state fields kept when the session is reset
+_KEEP_ON_RESET = frozenset(("txt_resume", "layouts", "layout", "MODEL"))
+
+# session_state fields and the factories of their default values; a factory
+# gives every mutable default its own object
+_DEFAULTS = (
+    # controllers states
+    ("btn_summary", bool),
+    ("btn_analyse", bool),
+    ("btn_estimate", bool),
+    ("btn_generate_statement", bool),
+    ("btn_sort_skills", bool),
+    ("btn_generate_skills", bool),
+    ("skills_number_changed", bool),
+    ("messages_initalised", bool),
+    # text fields
+    ("txt_jd", str),
+    ("txt_resume", str),
+    ("txt_skills", str),
+    ("statement", str),
+    ("dl_link", str),
+    ("letter", str),
+    ("company_role", str),
+    ("job_analysed", str),
+    # list fields
+    ("new_statements", list),
+    ("new_skills", list),
+    ("experiences", list),
+    ("motivations", list),
+    ("skills", list),
+    ("sorted_skills", list),
+    ("chosen_skills", list),
+    ("background", list),
+    ("messages", list),
+    ("project_choices", list),
+    # int fields
+    ("max_skills_number", int),
+    ("experiences_version", int),
+    ("prompt_tokens", int),
+    ("completion_tokens", int),
+    ("total_tokens", int),
+    # float fields
+    ("temperature_message", lambda: 0.5),
+)
+
 
 def init_state(name, value: Any = False):
     """
@@ -26,73 +74,26 @@ def initialise(formatted=True):
     Returns:
     None
     """
-    # initialise controllers states
-    state_fields = [
-        "btn_summary",
-        "btn_analyse",
-        "btn_estimate",
-        "btn_generate_statement",
-        "btn_sort_skills",
-        "btn_generate_skills",
-        "skills_number_changed",
-        "messages_initalised",
-    ]
-    for field in state_fields:
-        init_state(field, False)
-
-    # initialise text fields
-    text_fields = [
-        "txt_jd",
-        "txt_resume",
-        "txt_skills",
-        "statement",
-        "dl_link",
-        "letter",
-        "company_role",
-        "job_analysed",
-    ]
-
-    for field in text_fields:
-        init_state(field, "")
-
-    # initialise list fields
-    list_fields = [
-        "new_statements",
-        "new_skills",
-        "experiences",
-        "motivations",
-        "skills",
-        "sorted_skills",
-        "chosen_skills",
-        "background",
-        "messages",
-        "project_choices",
-    ]
-
-    for field in list_fields:
-        init_state(field, [])
-
-    # initialise int fields
-    int_fields = [
-        "max_skills_number",
-        "prompt_tokens",
-        "completion_tokens",
-        "total_tokens",
-    ]
-    for field in int_fields:
-        init_state(field, 0)
-
-    # initialise float fields
-    float_fields = ["temperature_message"]
-    for field in float_fields:
-        init_state(field, 0.5)
+    # snapshot the existing keys once instead of querying session_state
+    # for every field
+    existing = set(st.session_state)
+
+    def init_field(name, value):
+        if name not in existing:
+            st.session_state[name] = value
+            existing.add(name)
+
+    # initialise controllers states, text, list, int and float fields
+    for field, factory in _DEFAULTS:
+        if field not in existing:
+            st.session_state[field] = factory()
 
     # initialise GPT MODEL
-    init_state("MODEL", get_default_mode())
+    init_field("MODEL", get_default_mode())
 
     # initialise layout options
-    init_state("layouts", ["centered", "wide"])
-    init_state("layout", st.session_state["layouts"][0])
+    init_field("layouts", _LAYOUTS)
+    init_field("layout", _LAYOUTS[0])
 
     if formatted:
         custom_layout()
@@ -117,10 +118,13 @@ def reset():
     Resets the current session while keeping the text input of resume. It \
     then executes ''initialise()'' and ''switch_page(''Job description'')''.
     """
-    keep_list = ["txt_resume", "layouts", "layout", "MODEL"]
     if st.button("Warning: Reset", help="You will lose all your progress!"):
-        for key in st.session_state:
-            if key not in keep_list:
-                del st.session_state[key]
+        preserved = {
+            key: st.session_state[key]
+            for key in _KEEP_ON_RESET
+            if key in st.session_state
+        }
+        st.session_state.clear()
+        st.session_state.update(preserved)
         initialise()
         switch_page("Job description")
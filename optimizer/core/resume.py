@@ -6,11 +6,9 @@ descriptions, experiences, and contributions to be exported for a project.
 
 from typing import Union
 from collections import OrderedDict
-import copy
 import streamlit as st
 
 from optimizer.utils.extract import (
-    extract_version_number,
     extract_code,
     extract_html_list,
 )
@@ -35,11 +33,7 @@ def parse_statements(replies: list) -> list:
     A list of strings representing statements extracted from replies.
 
     """
-    statements = []
-    for reply in replies:
-        statement = extract_code(reply)
-        statements.append(statement)
-    return statements
+    return [extract_code(reply) for reply in replies]
 
 
 def choose_statement() -> str:
@@ -85,6 +79,22 @@ def choose_skills():
     return st.session_state["skills"]
 
 
+def get_choice_index(choice: str) -> int:
+    """
+    Returns the index of the new version selected by a choice of the form \
+    'Version 1: 30 words'. Version 0 is the original text, so its index \
+    is -1.
+
+    Parameters:
+    choice (str): The selected option.
+
+    Returns:
+    int: The index of the chosen version in the list of new versions.
+    """
+    version = choice.partition(":")[0]
+    return int(version.rpartition(" ")[2]) - 1
+
+
 def choose_project_description(project):
     """
     Selects a description to export.
@@ -103,9 +113,12 @@ def choose_project_description(project):
     choice_key = "description_choice_" + project["uuid"]
     choice_field = "new_descriptions_" + project["uuid"]
     # use default description
-    if not all(key in st.session_state for key in (choice_key, choice_field)):
+    if (
+        choice_key not in st.session_state
+        or choice_field not in st.session_state
+    ):
         return project["description"]
-    index = int(extract_version_number(st.session_state[choice_key])) - 1
+    index = get_choice_index(st.session_state[choice_key])
     if index == -1:
         return project["description"]
     return st.session_state[choice_field][index].strip()
@@ -153,9 +166,12 @@ def choose_contributions(project):
     choice_key = "contributions_choice_" + project["uuid"]
     choice_field = "new_contributions_" + project["uuid"]
     # use default contributions
-    if not all(key in st.session_state for key in (choice_key, choice_field)):
+    if (
+        choice_key not in st.session_state
+        or choice_field not in st.session_state
+    ):
         return project["contributions"]
-    index = int(extract_version_number(st.session_state[choice_key])) - 1
+    index = get_choice_index(st.session_state[choice_key])
     if index == -1:
         return project["contributions"]
     contributions = st.session_state[choice_field][index].strip()
@@ -165,6 +181,37 @@ def choose_contributions(project):
     return contributions_new
 
 
+def clone_experience(exp: dict) -> dict:
+    """
+    Returns a copy of an experience dictionary that can be modified without \
+    affecting the original. The experience holds at most two levels of \
+    containers (projects and their contributions), which are copied \
+    explicitly; strings are immutable and shared.
+
+    Parameters:
+    exp (dict): The experience dictionary to be copied.
+
+    Returns:
+    dict: a copy of the experience dictionary.
+    """
+    clone = {}
+    for key, value in exp.items():
+        if isinstance(value, list):
+            value = [
+                (
+                    {
+                        k: list(v) if isinstance(v, list) else v
+                        for k, v in item.items()
+                    }
+                    if isinstance(item, dict)
+                    else item
+                )
+                for item in value
+            ]
+        clone[key] = value
+    return clone
+
+
 def find_experience(experiences, exp_uuid):
     """
     Returns the experience dictionary from the given list of experiences \
@@ -175,12 +222,27 @@ def find_experience(experiences, exp_uuid):
     exp_uuid (str): UUID of the experience to be searched.
 
     Returns:
-    dict: a deep copy of the experience dictionary that has the specified UUID.
+    dict: a copy of the experience dictionary that has the specified UUID.
+
+    """
+    exp = next((e for e in experiences if e["uuid"] == exp_uuid), None)
+    if exp is None:
+        return None
+    return clone_experience(exp)
+
+
+def index_experiences(experiences: list) -> dict:
+    """
+    Returns a dictionary that maps the UUID of each experience to the \
+    experience, so that repeated lookups do not scan the list.
+
+    Parameters:
+    experiences (list): A list of experience dictionaries.
 
+    Returns:
+    dict: a dictionary of the experiences keyed by their UUID.
     """
-    for exp in experiences:
-        if exp["uuid"] == exp_uuid:
-            return copy.deepcopy(exp)
+    return {exp["uuid"]: exp for exp in experiences}
 
 
 def get_parsed_resume():
@@ -229,22 +291,25 @@ def get_chosen_experiences(choices: list, options: dict) -> list:
     list: a list of experiences that have been selected by the user.
 
     """
+    index = index_experiences(st.session_state["experiences"])
     experiences = OrderedDict()  # experiences are ordered
     for choice in choices:
         proj_uuid = options[choice]["proj_uuid"]
         exp_uuid = options[choice]["exp_uuid"]
         if exp_uuid not in experiences:
-            exp = find_experience(st.session_state["experiences"], exp_uuid)
+            exp = clone_experience(index[exp_uuid])
             exp["chosen_projects"] = [proj_uuid]
             experiences[exp_uuid] = exp
         else:
             experiences[exp_uuid]["chosen_projects"].append(proj_uuid)
 
-    for key, exp in experiences.items():
-        for project in exp["projects"]:
-            if project["uuid"] not in exp["chosen_projects"]:
-                exp["projects"].remove(project)
-        experiences[key] = exp
+    for exp in experiences.values():
+        chosen_projects = set(exp["chosen_projects"])
+        exp["projects"] = [
+            project
+            for project in exp["projects"]
+            if project["uuid"] in chosen_projects
+        ]
 
     for key, exp in experiences.items():
         for project in exp["projects"]:
@@ -1,22 +1,52 @@
 """
-This module includes a decorator function that retries a function a specified number of times \
-if a specified exception occurs and a function that sends a request to the OpenAI API to generate \
-a completion for the specified model, messages, temperature and n.
+This module includes a decorator function that retries a function a \
+specified number of times if a specified exception occurs and a function \
+that sends a request to the OpenAI API to generate a completion for the \
+specified model, messages, temperature and n.
 """
 
+from functools import lru_cache
+import json
+import threading
+import time
 import streamlit as st
 from dotenv import dotenv_values
 import requests
+from requests.adapters import HTTPAdapter
 
+from optimizer.gpt.cache import get_cached_reply, store_reply
 from optimizer.gpt.token import num_tokens_from_messages
 from optimizer.utils.web import retry
 
+try:
+    # orjson encodes large prompts several times faster than json
+    from orjson import dumps as encode_json
+except ImportError:
+
+    def encode_json(obj):
+        """Encodes an object as UTF-8 JSON bytes."""
+        return json.dumps(obj).encode("utf-8")
+
+
 MODELS = {
     "gpt-4o": 128000,
     "gpt-4o-mini": 128000,
 }
 
-SYSTEM_ROLE = "You are my Career Coach. You will help me revise my resume for a target job."
+OPENAI_API_URL = r"https://api.openai.com/v1/chat/completions"
+
+# keep-alive connections to the API; at least as many as concurrent requests
+MAX_CONNECTIONS = 8
+
+# default requests and tokens per minute allowed for each model; the .env
+# file overrides them with <MODEL>_RPM and <MODEL>_TPM, e.g. GPT_4O_MINI_RPM
+RATE_LIMITS = {
+    "gpt-4o": (500, 30000),
+    "gpt-4o-mini": (500, 200000),
+}
+
+# guards the token counters when replies are collected from worker threads
+_USAGE_LOCK = threading.Lock()
 
 
 def get_model_names():
@@ -67,13 +97,294 @@ def get_model_index_by_name(model_name):
     return model_names.index(model_name)
 
 
-@retry(requests.exceptions.Timeout, tries=5, delay=1, backoff=2, max_delay=120)
+@lru_cache(maxsize=1)
+def get_openai_api_key():
+    """
+    Returns the OpenAI API key from the .env file. The file is only read \
+    on the first call.
+
+    Returns:
+        str: The OpenAI API key.
+    """
+    config = dotenv_values(".env")
+    return config["OPENAI_API_KEY"]
+
+
+@lru_cache(maxsize=1)
+def get_openai_session():
+    """
+    Returns a shared HTTP session for the OpenAI API. The session keeps \
+    its connections alive, so consecutive requests skip the TCP and TLS \
+    handshakes.
+
+    Returns:
+        requests.Session: The session with the authorization headers set.
+    """
+    session = requests.Session()
+    # all requests go to one host; blocking on a full pool makes extra
+    # threads wait for a warm connection instead of opening a throwaway one
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=1, pool_maxsize=MAX_CONNECTIONS, pool_block=True
+        ),
+    )
+    session.headers.update(
+        {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {get_openai_api_key()}",
+        }
+    )
+    return session
+
+
+class RateLimitError(requests.exceptions.HTTPError):
+    """Raised when the OpenAI API rejects a request with status 429."""
+
+
+class RateLimiter:
+    """
+    Token bucket that holds requests back until they fit in the requests \
+    and tokens per minute limits of a model, so concurrent requests do not \
+    run into 429 errors. Both capacities refill continuously.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_requests = requests_per_minute
+        self.available_tokens = tokens_per_minute
+        self.last_update = time.monotonic()
+        self.lock = threading.Lock()
+
+    def refill(self):
+        """Adds the capacity regained since the last update."""
+        now = time.monotonic()
+        minutes = (now - self.last_update) / 60
+        self.available_requests = min(
+            self.requests_per_minute,
+            self.available_requests + minutes * self.requests_per_minute,
+        )
+        self.available_tokens = min(
+            self.tokens_per_minute,
+            self.available_tokens + minutes * self.tokens_per_minute,
+        )
+        self.last_update = now
+
+    def acquire(self, num_tokens):
+        """
+        Blocks until one request of the given size can be sent.
+
+        Args:
+            num_tokens (int): The estimated number of tokens of the request.
+        """
+        num_tokens = min(num_tokens, self.tokens_per_minute)
+        while True:
+            with self.lock:
+                self.refill()
+                if (
+                    self.available_requests >= 1
+                    and self.available_tokens >= num_tokens
+                ):
+                    self.available_requests -= 1
+                    self.available_tokens -= num_tokens
+                    return
+                # seconds until both capacities are sufficient
+                wait = 60 * max(
+                    (1 - self.available_requests) / self.requests_per_minute,
+                    (num_tokens - self.available_tokens)
+                    / self.tokens_per_minute,
+                )
+            time.sleep(wait)
+
+
+class UnlimitedRateLimiter:
+    """
+    Rate limiter of a model without known limits, which never holds a \
+    request back and leaves the limits to the API.
+    """
+
+    def acquire(self, num_tokens):
+        """Returns at once, whatever the size of the request."""
+
+
+def get_rate_limits(model):
+    """
+    Returns the rate limits of a model, read from the .env file with the \
+    values in RATE_LIMITS as defaults.
+
+    Args:
+        model (str): The ID of the model.
+
+    Returns:
+        tuple: The requests and tokens per minute of the model, or None if \
+            the limits of the model are not known.
+    """
+    config = dotenv_values(".env")
+    prefix = model.upper().replace("-", "_").replace(".", "_")
+    limits = list(RATE_LIMITS.get(model, (None, None)))
+    for i, suffix in enumerate(("_RPM", "_TPM")):
+        if config.get(prefix + suffix):
+            limits[i] = int(config[prefix + suffix])
+    if None in limits:
+        return None
+    return tuple(limits)
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(model):
+    """
+    Returns the rate limiter shared by all requests to a model. The limits \
+    are only read on the first call for each model.
+
+    Args:
+        model (str): The ID of the model.
+
+    Returns:
+        RateLimiter: The rate limiter of the model, or an \
+            UnlimitedRateLimiter if its limits are not known.
+    """
+    limits = get_rate_limits(model)
+    if limits is None:
+        return UnlimitedRateLimiter()
+    return RateLimiter(*limits)
+
+
+def coalesce_messages(messages):
+    """
+    Merges runs of consecutive messages of the same role into one message, \
+    joining their contents with new lines. Every message costs a few tokens \
+    of framing, and the prompts here send many short user messages in a row. \
+    The input messages are not modified.
+
+    Args:
+        messages (list): A list of past conversation messages.
+
+    Returns:
+        list: The coalesced messages.
+    """
+    coalesced = []
+    for message in messages:
+        # only plain role and content messages can be merged
+        if (
+            coalesced
+            and len(message) == 2
+            and len(coalesced[-1]) == 2
+            and coalesced[-1]["role"] == message["role"]
+        ):
+            content = coalesced[-1]["content"] + "\n" + message["content"]
+            coalesced[-1] = {"role": message["role"], "content": content}
+        else:
+            coalesced.append(message)
+    return coalesced
+
+
+def is_too_long(messages, model):
+    """
+    Checks whether the messages exceed 90% of the context window of the \
+    model. Every token covers at least one byte of text, so messages whose \
+    byte length is below the limit are accepted without tokenising them.
+
+    Args:
+        messages (list): A list of past conversation messages.
+        model (str): The ID of the model to use.
+
+    Returns:
+        bool: True if the messages are too long for the model.
+    """
+    max_tokens = MODELS[model] * 0.9
+    # upper bound: one token per byte, plus the per-message overhead
+    max_num_tokens = 3 + sum(
+        4 + sum(len(value.encode("utf-8")) for value in message.values())
+        for message in messages
+    )
+    if max_num_tokens <= max_tokens:
+        return False
+    return num_tokens_from_messages(messages, model) > max_tokens
+
+
+def post_completion(body, model, stream=False):
+    """
+    Posts a chat completion request to the OpenAI API once it fits in the \
+    rate limits of the model. This function does not touch the Streamlit \
+    session, so it can run in worker threads.
+
+    Args:
+        body (bytes): The JSON encoded body of the request.
+        model (str): The ID of the model in the body.
+        stream (bool, optional): Whether to return before the body is \
+            downloaded, for streamed completions. Defaults to False.
+
+    Returns:
+        requests.Response: The successful HTTP response.
+    """
+    # roughly four bytes of JSON per token
+    get_rate_limiter(model).acquire(len(body) // 4)
+    response = get_openai_session().post(
+        OPENAI_API_URL, data=body, timeout=(300, 600), stream=stream
+    )
+    if response.status_code == 429:
+        raise RateLimitError(response.reason, response=response)
+    response.raise_for_status()
+    return response
+
+
+def add_usage(usage):
+    """
+    Adds the token usage of a response to the session state.
+
+    Args:
+        usage (dict): The usage object of an OpenAI response.
+    """
+    with _USAGE_LOCK:
+        for field in ["prompt_tokens", "completion_tokens", "total_tokens"]:
+            if field in usage:
+                st.session_state[field] += usage[field]
+
+
+def collect_replies(response_objs):
+    """
+    Adds the token usage of decoded OpenAI responses to the session state \
+    and collects the content of their choices.
+
+    Args:
+        response_objs (list): The decoded JSON bodies of the responses.
+
+    Returns:
+        list or str or None: A list of generated completions, \
+            a single generated completion or None if no completion could \
+            be generated.
+    """
+    replies = []
+    for response_obj in response_objs:
+        add_usage(response_obj["usage"])
+        for choice in response_obj["choices"]:
+            if choice["finish_reason"] == "length":
+                st.write("### :red[Your input is too long!]")
+                return None
+            replies.append(choice["message"]["content"])
+
+    if len(replies) == 0:
+        return None
+    if len(replies) == 1:
+        return replies[0]
+    return replies
+
+
+@retry(
+    (requests.exceptions.Timeout, RateLimitError),
+    tries=5,
+    delay=1,
+    backoff=2,
+    max_delay=120,
+)
 def call_openai_api(
-    messages, temperature=0.1, number_completion=1, model=None
+    messages, temperature=0.1, number_completion=1, model=None, persist=False
 ):
     """
     Function that sends a request to the OpenAI API to \
-        generate a completion for the specified model, messages, temperature and n.
+        generate a completion for the specified model, messages, \
+        temperature and n.
 
     Args:
         model (str): The ID of the model to use.
@@ -82,49 +393,115 @@ def call_openai_api(
             Controls the "creativity" of the generated completion. \
             A higher value means more creative,\
             a lower value means more predictable. Defaults to 0.1.
-        n (int, optional): The number of completions to generate. Defaults to 1.
+        number_completion (int, optional): The number of completions to \
+            generate. They are sampled server-side from a single request, so \
+            the prompt is sent and billed once. Defaults to 1.
+        persist (bool, optional): Whether to answer identical requests \
+            from the persistent reply cache. Only suitable for queries \
+            that need no fresh sample. Defaults to False.
 
     Returns:
         list or str or None: A list of generated completions, \
-            a single generated completion or None if no completion could be generated.
+            a single generated completion or None if no completion could \
+            be generated.
     """
     if model is None:
         model = st.session_state["MODEL"]
-    num_tokens = num_tokens_from_messages(messages, model)
-    if num_tokens > MODELS[model] * 0.9:
+    messages = coalesce_messages(messages)
+    if is_too_long(messages, model):
         st.write("### :red[Your input is too long!]")
         return None
-    config = dotenv_values(".env")
-    openai_api_key = config["OPENAI_API_KEY"]
-    url = r"https://api.openai.com/v1/chat/completions"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {openai_api_key}",
-    }
     data = {
         "model": model,
         "messages": messages,
         "temperature": temperature,
         "n": number_completion,
     }
-    response = requests.post(
-        url, headers=headers, json=data, timeout=(300, 600)
-    )
-    response.raise_for_status()
-    response_obj = response.json()
-    for field in ["prompt_tokens", "completion_tokens", "total_tokens"]:
-        if field in response_obj["usage"]:
-            st.session_state[field] += response_obj["usage"][field]
-    choices = response.json()["choices"]
-    replies = []
-    for choice in choices:
-        if choice["finish_reason"] == "length":
-            st.write("### :red[Your input is too long!]")
-            return None
-        replies.append(choice["message"]["content"])
+    body = encode_json(data)
+    if persist:
+        reply = get_cached_reply(body)
+        if reply is not None:
+            return reply
+    response = post_completion(body, model)
+    reply = collect_replies([response.json()])
+    if persist and reply is not None:
+        store_reply(body, reply)
+    return reply
 
-    if len(replies) == 0:
+
+def iter_stream_chunks(response):
+    """
+    Decodes the server-sent events of a streamed chat completion.
+
+    Args:
+        response (requests.Response): The streamed HTTP response.
+
+    Yields:
+        dict: The decoded completion chunks.
+    """
+    for line in response.iter_lines():
+        if not line.startswith(b"data: "):
+            continue
+        data = line[len(b"data: ") :]
+        if data == b"[DONE]":
+            break
+        yield json.loads(data)
+
+
+@retry(
+    (requests.exceptions.Timeout, RateLimitError),
+    tries=5,
+    delay=1,
+    backoff=2,
+    max_delay=120,
+)
+def call_openai_api_stream(messages, temperature=0.1, model=None):
+    """
+    Function that streams a single completion from the OpenAI API and \
+        shows the tokens on the page as they arrive, so the user does not \
+        wait for the whole completion to see the reply.
+
+    Args:
+        messages (list): A list of past conversation messages.
+        temperature (float, optional): \
+            Controls the "creativity" of the generated completion. \
+            Defaults to 0.1.
+        model (str, optional): The ID of the model to use.
+
+    Returns:
+        str or None: The generated completion or None if no completion \
+            could be generated.
+    """
+    if model is None:
+        model = st.session_state["MODEL"]
+    messages = coalesce_messages(messages)
+    if is_too_long(messages, model):
+        st.write("### :red[Your input is too long!]")
         return None
-    if len(replies) == 1:
-        return replies[0]
-    return replies
+    data = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    response = post_completion(encode_json(data), model, stream=True)
+    placeholder = st.empty()
+    parts = []
+    with response:
+        for chunk in iter_stream_chunks(response):
+            if chunk.get("usage"):
+                add_usage(chunk["usage"])
+            for choice in chunk["choices"]:
+                if choice["finish_reason"] == "length":
+                    placeholder.empty()
+                    st.write("### :red[Your input is too long!]")
+                    return None
+                content = choice["delta"].get("content")
+                if content:
+                    parts.append(content)
+                    placeholder.markdown("".join(parts))
+    placeholder.empty()
+    if len(parts) == 0:
+        return None
+    return "".join(parts)
@@ -0,0 +1,176 @@
+"""
+This module sends chat completion requests through the OpenAI Batch API, \
+which processes them asynchronously within 24 hours at half the price and \
+with a separate rate limit. It suits bulk generation that does not need an \
+immediate reply.
+"""
+
+import json
+import time
+import uuid
+import streamlit as st
+
+from optimizer.gpt.api import (
+    coalesce_messages,
+    collect_replies,
+    encode_json,
+    get_openai_session,
+    is_too_long,
+)
+
+OPENAI_FILES_URL = r"https://api.openai.com/v1/files"
+
+OPENAI_BATCHES_URL = r"https://api.openai.com/v1/batches"
+
+FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def build_batch_request(
+    messages, temperature=0.1, number_completion=1, model=None
+):
+    """
+    Builds one line of a batch input file.
+
+    Args:
+        messages (list): A list of past conversation messages.
+        temperature (float, optional): The sampling temperature. Defaults \
+            to 0.1.
+        number_completion (int, optional): The number of completions to \
+            generate. Defaults to 1.
+        model (str, optional): The ID of the model to use.
+
+    Returns:
+        dict: The request with a random custom id.
+    """
+    if model is None:
+        model = st.session_state["MODEL"]
+    return {
+        "custom_id": uuid.uuid4().hex,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": model,
+            "messages": coalesce_messages(messages),
+            "temperature": temperature,
+            "n": number_completion,
+        },
+    }
+
+
+def submit_batch(batch_requests):
+    """
+    Uploads the requests as a JSONL file and creates a batch for them.
+
+    Args:
+        batch_requests (list): The requests built by build_batch_request.
+
+    Returns:
+        str: The ID of the created batch.
+    """
+    session = get_openai_session()
+    jsonl = b"\n".join(encode_json(request) for request in batch_requests)
+    # drop the JSON content type of the session for the multipart upload
+    response = session.post(
+        OPENAI_FILES_URL,
+        data={"purpose": "batch"},
+        files={"file": ("batch.jsonl", jsonl)},
+        headers={"Content-Type": None},
+        timeout=(300, 600),
+    )
+    response.raise_for_status()
+    response = session.post(
+        OPENAI_BATCHES_URL,
+        data=encode_json(
+            {
+                "input_file_id": response.json()["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            }
+        ),
+        timeout=(300, 600),
+    )
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def wait_for_batch(batch_id, interval=30):
+    """
+    Polls a batch until it finishes and downloads its results.
+
+    Args:
+        batch_id (str): The ID of the batch.
+        interval (int, optional): The seconds between two polls. Defaults \
+            to 30.
+
+    Returns:
+        dict: The response bodies by custom id, or None if the batch did \
+            not complete.
+    """
+    session = get_openai_session()
+    while True:
+        response = session.get(f"{OPENAI_BATCHES_URL}/{batch_id}", timeout=60)
+        response.raise_for_status()
+        batch = response.json()
+        if batch["status"] in FINAL_STATUSES:
+            break
+        time.sleep(interval)
+    if batch["status"] != "completed" or batch["output_file_id"] is None:
+        return None
+    response = session.get(
+        f"{OPENAI_FILES_URL}/{batch['output_file_id']}/content",
+        timeout=(300, 600),
+    )
+    response.raise_for_status()
+    results = {}
+    for line in response.text.splitlines():
+        if line:
+            result = json.loads(line)
+            if result["response"] is not None:
+                results[result["custom_id"]] = result["response"]["body"]
+    return results
+
+
+def call_openai_api_batch(
+    messages_list, temperature=0.1, number_completion=1, model=None
+):
+    """
+    Generates completions for several conversations with one batch and \
+    waits for the batch to finish.
+
+    Args:
+        messages_list (list): The conversations to complete.
+        temperature (float, optional): The sampling temperature. Defaults \
+            to 0.1.
+        number_completion (int, optional): The number of completions to \
+            generate for each conversation. Defaults to 1.
+        model (str, optional): The ID of the model to use.
+
+    Returns:
+        list: The replies of each conversation, in the same order, as \
+            returned by call_openai_api. Conversations too long for the \
+            model get None without being submitted.
+    """
+    batch_requests = []
+    for messages in messages_list:
+        request = build_batch_request(
+            messages, temperature, number_completion, model
+        )
+        # a too long request would only fail after the batch has run
+        if is_too_long(request["body"]["messages"], request["body"]["model"]):
+            st.write("### :red[Your input is too long!]")
+            request = None
+        batch_requests.append(request)
+    submitted = [request for request in batch_requests if request is not None]
+    if len(submitted) == 0:
+        return [None] * len(batch_requests)
+    results = wait_for_batch(submit_batch(submitted))
+    if results is None:
+        return [None] * len(batch_requests)
+    return [
+        (
+            collect_replies([results[request["custom_id"]]])
+            if request is not None and request["custom_id"] in results
+            else None
+        )
+        for request in batch_requests
+    ]
@@ -0,0 +1,143 @@
+"""
+This module persists the replies of the OpenAI API in a SQLite database, \
+keyed by a digest of the request body, so identical requests are answered \
+without calling the API again, across sessions and restarts. Replies older \
+than CACHE_MAX_AGE are dropped and at most CACHE_MAX_ROWS are kept. Setting \
+REPLY_CACHE=0 in the environment or the .env file disables the cache.
+"""
+
+from functools import lru_cache
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dotenv import dotenv_values
+
+CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "aijoboptimizer", "replies.sqlite3"
+)
+
+# seconds after which a reply is stale, models are updated in place
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# replies kept at most, the least recent are pruned first
+CACHE_MAX_ROWS = 10000
+
+# one connection is shared by the worker threads of a process
+_CACHE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def is_cache_enabled():
+    """
+    Returns whether replies are persisted, which is set by REPLY_CACHE in \
+    the environment or else in the .env file. The cache is enabled unless \
+    it is set to 0, false, no or off.
+
+    Returns:
+        bool: Whether the cache is enabled.
+    """
+    value = os.environ.get("REPLY_CACHE")
+    if value is None:
+        value = dotenv_values(".env").get("REPLY_CACHE")
+    return (value or "").strip().lower() not in ("0", "false", "no", "off")
+
+
+@lru_cache(maxsize=1)
+def get_connection():
+    """
+    Returns the connection to the cache database, creating it if needed.
+
+    Returns:
+        sqlite3.Connection: The connection to the cache database.
+    """
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    connection = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS replies (key BLOB PRIMARY KEY, reply TEXT)"
+    )
+    columns = [
+        row[1] for row in connection.execute("PRAGMA table_info(replies)")
+    ]
+    if "created" not in columns:
+        # rows of older databases count as stale and are pruned first
+        connection.execute(
+            "ALTER TABLE replies ADD COLUMN created REAL NOT NULL DEFAULT 0"
+        )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS replies_created ON replies (created)"
+    )
+    return connection
+
+
+def get_key(body):
+    """
+    Returns the cache key of a request.
+
+    Args:
+        body (bytes): The JSON encoded body of the request.
+
+    Returns:
+        bytes: The 16-byte digest of the body.
+    """
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def get_cached_reply(body):
+    """
+    Looks up the reply of a previous identical request.
+
+    Args:
+        body (bytes): The JSON encoded body of the request.
+
+    Returns:
+        list or str or None: The cached reply, or None if there is none, \
+            it is stale or the cache is disabled.
+    """
+    if not is_cache_enabled():
+        return None
+    with _CACHE_LOCK:
+        row = (
+            get_connection()
+            .execute(
+                "SELECT reply FROM replies WHERE key = ? AND created >= ?",
+                (get_key(body), time.time() - CACHE_MAX_AGE),
+            )
+            .fetchone()
+        )
+    if row is None:
+        return None
+    return json.loads(row[0])
+
+
+def store_reply(body, reply):
+    """
+    Stores the reply of a request, and prunes the stale replies and the \
+    least recent ones beyond CACHE_MAX_ROWS. Does nothing if the cache is \
+    disabled.
+
+    Args:
+        body (bytes): The JSON encoded body of the request.
+        reply (list or str): The reply of the request.
+    """
+    if not is_cache_enabled():
+        return
+    now = time.time()
+    with _CACHE_LOCK:
+        connection = get_connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO replies (key, reply, created) "
+            "VALUES (?, ?, ?)",
+            (get_key(body), json.dumps(reply), now),
+        )
+        connection.execute(
+            "DELETE FROM replies WHERE created < ?", (now - CACHE_MAX_AGE,)
+        )
+        connection.execute(
+            "DELETE FROM replies WHERE key NOT IN (SELECT key FROM replies "
+            "ORDER BY created DESC LIMIT ?)",
+            (CACHE_MAX_ROWS,),
+        )
+        connection.commit()
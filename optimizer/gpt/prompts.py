@@ -0,0 +1,233 @@
+"""
+This module builds the messages of the prompts sent to the GPT API. It does \
+not depend on Streamlit: the builders take the job description and resume \
+data as arguments, so they can be imported, tested and reused outside of \
+the app.
+"""
+
+SYSTEM_ROLE = (
+    "You are my Career Coach. You will help me revise my resume for a target "
+    "job."
+)
+
+SECRETARY_ROLE = """You are my secretary. I need you to identify and \
+extract all the information of a resume. You have to do it very carefully."""
+
+# static messages shared by the prompts instead of being rebuilt per call;
+# they are never mutated, as call_openai_api only encodes the messages
+SYSTEM_MSG = {"role": "system", "content": SYSTEM_ROLE}
+
+SECRETARY_MSG = {"role": "system", "content": SECRETARY_ROLE}
+
+CODE_TAGS_MSGS = (
+    {
+        "role": "user",
+        "content": "Please always surround the output with code tags by \
+using the following syntax:",
+    },
+    {"role": "user", "content": "<code> Your message here </code>"},
+)
+
+
+def get_profile_msgs(
+    txt_jd: str, skills_str: str, experiences_str: str
+) -> list:
+    """
+    Builds the messages giving the job description, the skills and the \
+    experiences, which open the statement and motivation letter prompts.
+
+    Parameters:
+    txt_jd (str): The job description.
+    skills_str (str): The skills separated by commas.
+    experiences_str (str): The experiences as a JSON string.
+
+    Returns:
+    list: The messages to be followed by the writing instructions.
+    """
+    return [
+        SYSTEM_MSG,
+        {"role": "assistant", "content": "The job description is following:"},
+        {"role": "assistant", "content": txt_jd},
+        {
+            "role": "assistant",
+            "content": "Can you tell me about your skills and experiences?",
+        },
+        {"role": "user", "content": "I will give you my skills as following:"},
+        {"role": "user", "content": skills_str},
+        {
+            "role": "user",
+            "content": "I will give you my experiences as \
+        following:",
+        },
+        {"role": "user", "content": experiences_str},
+    ]
+
+
+def get_statement_msgs(
+    txt_jd: str,
+    skills_str: str,
+    experiences_str: str,
+    statement: str,
+    words: int,
+) -> list:
+    """
+    Builds the prompt asking for a new personal statement.
+
+    Parameters:
+    txt_jd (str): The job description.
+    skills_str (str): The skills separated by commas.
+    experiences_str (str): The experiences as a JSON string.
+    statement (str): The current personal statement.
+    words (int): The number of words of the new statement.
+
+    Returns:
+    list: The messages of the prompt.
+    """
+    return get_profile_msgs(txt_jd, skills_str, experiences_str) + [
+        {
+            "role": "user",
+            "content": "I will give you my personal statement \
+        as following:",
+        },
+        {"role": "user", "content": statement},
+        {
+            "role": "user",
+            "content": f"Can you write a new personal \
+        statement for me in {words} words, connecting my skills and \
+        experiences with the job description?",
+        },
+        *CODE_TAGS_MSGS,
+    ]
+
+
+def get_skills_msgs(txt_jd: str, number: int) -> list:
+    """
+    Builds the prompt asking for the ATS keywords of a job description.
+
+    Parameters:
+    txt_jd (str): The job description.
+    number (int): The number of keywords to identify.
+
+    Returns:
+    list: The messages of the prompt.
+    """
+    return [
+        SYSTEM_MSG,
+        {"role": "assistant", "content": "The job description is following:"},
+        {"role": "assistant", "content": txt_jd},
+        {
+            "role": "user",
+            "content": f"From the job description, can you \
+        identify {number} specific keywords used by an ATS system?",
+        },
+        {
+            "role": "user",
+            "content": "Can you please list the keywords like \
+        keyword1, keyword2, and keyword3 separately using commas instead of \
+        'and' to join the last two keywords, and provide your response in a \
+        single paragraph?",
+        },
+        {
+            "role": "user",
+            "content": "Please always surround the output with \
+        code tags by using the following syntax:",
+        },
+        {
+            "role": "user",
+            "content": "<code>keyword1, keyword2, keyword3</code>",
+        },
+    ]
+
+
+def get_description_msgs(txt_jd: str, project: dict, words: int) -> list:
+    """
+    Builds the prompt asking to rephrase a project description.
+
+    Parameters:
+    txt_jd (str): The job description.
+    project (dict): The project with its title and description.
+    words (int): The number of words of the new description.
+
+    Returns:
+    list: The messages of the prompt.
+    """
+    return [
+        SYSTEM_MSG,
+        {"role": "assistant", "content": "The job description is following:"},
+        {"role": "assistant", "content": txt_jd},
+        {
+            "role": "user",
+            "content": f"Now I want to rewrite the project key \
+        description for project: {project['title']}.",
+        },
+        {
+            "role": "user",
+            "content": f"The project description is: \
+        {project['description']}.",
+        },
+        {
+            "role": "user",
+            "content": f"Can you rephrase the project \
+        description in {words} words, to align with the job description?",
+        },
+        *CODE_TAGS_MSGS,
+    ]
+
+
+def get_contribution_msgs(
+    txt_jd: str, project: dict, words: int, number: int
+) -> list:
+    """
+    Builds the prompt asking to rewrite the key contributions of a project.
+
+    Parameters:
+    txt_jd (str): The job description.
+    project (dict): The project with its title, description and \
+    contributions.
+    words (int): The maximum number of words of each contribution.
+    number (int): The number of contributions to write.
+
+    Returns:
+    list: The messages of the prompt.
+    """
+    contributions_str = "\n".join(project["contributions"])
+    return [
+        SYSTEM_MSG,
+        {"role": "assistant", "content": "The job description is following:"},
+        {"role": "assistant", "content": txt_jd},
+        {
+            "role": "user",
+            "content": f"Now I want to rewrite my key contributions for \
+            project: {project['title']}.",
+        },
+        {
+            "role": "user",
+            "content": f"The project description is: \
+        {project['description']}.",
+        },
+        {
+            "role": "user",
+            "content": "These are my key contributions \
+        for the project:",
+        },
+        {"role": "user", "content": contributions_str},
+        {
+            "role": "user",
+            "content": f"Can you analyse them and write \
+        {number} new key contributions in {words} words, to align with the \
+        job description?",
+        },
+        {
+            "role": "user",
+            "content": "Formatting the output as html in \
+        unordered list; identifying the keywords relevant with the job \
+        description.",
+        },
+        {
+            "role": "user",
+            "content": "Please always surround the keywords \
+        with bold tags by using the following syntax:",
+        },
+        {"role": "user", "content": "<b> keywords </b>"},
+        *CODE_TAGS_MSGS,
+    ]
@@ -4,26 +4,76 @@ information from a resume.
 
 """
 
+from functools import lru_cache
+import hashlib
+import itertools
 import json
-import re
+import string
 from typing import Union
-import uuid
 import streamlit as st
 from optimizer.core.resume import (
     choose_experiences,
     choose_job_description,
     choose_skills,
 )
-from optimizer.gpt.api import SYSTEM_ROLE, call_openai_api
-from optimizer.utils.extract import extract_by_quotation_mark, extract_code
+from optimizer.gpt.api import (
+    call_openai_api,
+    call_openai_api_stream,
+    encode_json,
+)
+from optimizer.gpt.prompts import (
+    CODE_TAGS_MSGS,
+    SECRETARY_MSG,
+    SYSTEM_MSG,
+    get_contribution_msgs,
+    get_description_msgs,
+    get_profile_msgs,
+    get_skills_msgs,
+    get_statement_msgs,
+)
+from optimizer.utils.extract import extract_code, extract_numbered_paragraphs
+
+# the ids only tell the messages of a session apart, as widget keys
+MESSAGE_IDS = itertools.count()
+
 
+def get_message_id() -> str:
+    """Returns an id unique within the process for a chat message."""
+    return f"msg{next(MESSAGE_IDS):x}"
 
-SECRETARY_ROLE = """You are my secretary. I need you to identify and \
-extract all the information of a resume. You have to do it very carefully."""
+
+# deletes every ASCII character except letters, digits and spaces
+CONTRIBUTION_TABLE = str.maketrans(
+    "",
+    "",
+    "".join(
+        chr(i)
+        for i in range(128)
+        if chr(i) not in string.ascii_letters + string.digits + " "
+    ),
+)
+
+
+@lru_cache(maxsize=32)
+def get_digest(text: str) -> str:
+    """
+    Returns a 16-byte digest of a long text, such as the job description or \
+    the resume. The cached functions below are keyed on this digest and \
+    skip hashing the text, whose parameter starts with an underscore. \
+    Python caches the hash of a string, so looking up the digest of the \
+    same session string again does not rehash it.
+
+    Args:
+        text (str): The text to digest.
+
+    Returns:
+        str: The hexadecimal digest of the text.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
 
 
 @st.cache_data()
-def query_company_and_role(txt_jd) -> str:
+def query_company_and_role(jd_digest, _txt_jd) -> str:
     """
     Function to query the company and role from a given job description \
     using OpenAI's API.
@@ -39,9 +89,9 @@ def query_company_and_role(txt_jd) -> str:
         The spinner is disabled to prevent unnecessary UI clutter.
     """
     messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
+        SYSTEM_MSG,
         {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
+        {"role": "assistant", "content": _txt_jd},
         {
             "role": "user",
             "content": "Can you identify the role and the \
@@ -54,12 +104,12 @@ def query_company_and_role(txt_jd) -> str:
         },
         {"role": "user", "content": "<code>{company}_{role}</code>"},
     ]
-    reply = call_openai_api(messages, temperature=0.2)
+    reply = call_openai_api(messages, temperature=0.2, persist=True)
     return reply
 
 
 @st.cache_data(show_spinner=False)
-def get_company_role(txt_jd):
+def get_company_role(jd_digest, _txt_jd):
     """
     A function that uses the `query_company_and_role()` function to retrieve \
     the company and role information from the user input stored in the \
@@ -70,7 +120,7 @@ def get_company_role(txt_jd):
     Returns:
     - str: The extracted code from the retrieved company and role information.
     """
-    reply = query_company_and_role(txt_jd)
+    reply = query_company_and_role(jd_digest, _txt_jd)
     company_role = extract_code(reply)
     return company_role
 
@@ -89,7 +139,7 @@ def query_project_title(project_info: str) -> str:
     str: The extracted project name surrounded with code tags.
     """
     messages = [
-        {"role": "system", "content": SECRETARY_ROLE},
+        SECRETARY_MSG,
         {"role": "user", "content": "The following is the resume"},
         {"role": "user", "content": st.session_state["txt_resume"]},
         {
@@ -97,18 +147,12 @@ def query_project_title(project_info: str) -> str:
             "content": f"Can you find the project name with \
         this information: {project_info}?",
         },
-        {
-            "role": "user",
-            "content": "Please always surround the output \
-        with code tags by using the following syntax:",
-        },
-        {"role": "user", "content": "<code> Your message here </code>"},
+        *CODE_TAGS_MSGS,
     ]
-    reply = call_openai_api(messages, temperature=0.1)
-    result_str = extract_code(reply)
-    if result_str is None:
-        result_str = extract_by_quotation_mark(reply)
-    return result_str
+    reply = call_openai_api(messages, temperature=0.1, persist=True)
+    # extract_code already falls back to quoted text, with the same
+    # patterns as extract_by_quotation_mark, so one scan is enough
+    return extract_code(reply)
 
 
 @st.cache_data
@@ -117,13 +161,14 @@ def query_project_description(project: dict) -> str:
     Returns the project description of a given `project_name`.
 
     Args:
-    project_name (str): The name of the project to extract the description from.
+    project_name (str): The name of the project to extract the description \
+    from.
 
     Returns:
     str: The extracted project description, surrounded by code tags.
     """
     messages = [
-        {"role": "system", "content": SECRETARY_ROLE},
+        SECRETARY_MSG,
         {"role": "user", "content": "The following is the resume"},
         {"role": "user", "content": st.session_state["txt_resume"]},
         {
@@ -134,15 +179,14 @@ def query_project_description(project: dict) -> str:
         {"role": "user", "content": f"Project name/title: {project['title']}"},
         {
             "role": "user",
-            "content": "Can you find the project description from the resume located between the project name and key contributions?",
-        },
-        {
-            "role": "user",
-            "content": "Please always surround the output with code tags by using the following syntax:",
+            "content": (
+                "Can you find the project description from the resume "
+                "located between the project name and key contributions?"
+            ),
         },
-        {"role": "user", "content": "<code> Your message here </code>"},
+        *CODE_TAGS_MSGS,
     ]
-    reply = call_openai_api(messages, temperature=0.1)
+    reply = call_openai_api(messages, temperature=0.1, persist=True)
     result_str = extract_code(reply)
     return result_str
 
@@ -165,51 +209,61 @@ def query_project_contributions(project_name: str) -> Union[list, None]:
         list has been stripped of non-alphanumeric characters and whitespaces.
     """
     messages = [
-        {"role": "system", "content": SECRETARY_ROLE},
+        SECRETARY_MSG,
         {"role": "user", "content": "The following is my resume"},
         {"role": "user", "content": st.session_state["txt_resume"]},
         {
             "role": "user",
-            "content": f"Can you extract the key contributions of Project:  {project_name}?",
-        },
-        {
-            "role": "user",
-            "content": "Please always surround the output \
-        with code tags by using the following syntax:",
+            "content": (
+                "Can you extract the key contributions of Project:  "
+                f"{project_name}?"
+            ),
         },
-        {"role": "user", "content": "<code> Your message here </code>"},
+        *CODE_TAGS_MSGS,
     ]
-    reply = call_openai_api(messages, temperature=0.1)
+    reply = call_openai_api(messages, temperature=0.1, persist=True)
     result_str = extract_code(reply)
 
     # assemble contributions list, which contains strings that have \
     # been stripped of non-alphanumeric characters and whitespace.
     if result_str is not None:
         contributions = result_str.strip().split("\n")
+        # drop non-ASCII characters, then the remaining punctuation
         contributions = [
-            re.sub(r"[^A-Za-z0-9 ]+", "", c) for c in contributions
+            c.encode("ascii", "ignore")
+            .decode("ascii")
+            .translate(CONTRIBUTION_TABLE)
+            for c in contributions
         ]
     else:
         contributions = []
     return contributions
 
 
-@st.cache_data(show_spinner=False)
-def analyse_resume(txt_resume: str, temperature: float) -> str:
+@st.cache_resource(show_spinner=False)
+def analyse_resume(
+    resume_digest: str, _txt_resume: str, temperature: float, model: str
+) -> str:
     """Extracts information from a resume using GPT.
 
     Args:
-        txt_resume (str): The text of the resume to analyse.
-        temperature (float): The sampling temperature to use when generating responses.
+        resume_digest (str): The digest of the resume, used as cache key.
+        _txt_resume (str): The text of the resume to analyse.
+        temperature (float): The sampling temperature to use when \
+        generating responses.
+        model (str): The name of the model to query, also part of the \
+        cache key.
 
     Returns:
-        A dictionary-like object that contains the extracted information from the resume.
+        A dictionary-like object that contains the extracted information \
+        from the resume.
 
     Raises:
         ValueError: If the resume is empty or None.
-        JSONDecodeError: If the response from the OpenAI API is not a valid JSON string.
+        JSONDecodeError: If the response from the OpenAI API is not a \
+        valid JSON string.
     """
-    if txt_resume is None or len(txt_resume) == 0:
+    if _txt_resume is None or len(_txt_resume) == 0:
         raise ValueError("Invalid resume")
     temp_msgs = [
         {
@@ -219,20 +273,17 @@ def analyse_resume(txt_resume: str, temperature: float) -> str:
         do it very carefully.",
         },
         {"role": "user", "content": "The following is the resume"},
-        {"role": "user", "content": txt_resume},
+        {"role": "user", "content": _txt_resume},
         {
             "role": "user",
             "content": "Can you provide me with a valid JSON \
         string that contains all the complete information?",
         },
-        {
-            "role": "user",
-            "content": "Please always surround the output \
-        with code tags by using the following syntax:",
-        },
-        {"role": "user", "content": "<code> Your message here </code>"},
+        *CODE_TAGS_MSGS,
     ]
-    reply = call_openai_api(temp_msgs, temperature=temperature)
+    reply = call_openai_api(
+        temp_msgs, temperature=temperature, model=model, persist=True
+    )
     try:
         reply_obj = json.loads(reply)
         reply_json_str = json.dumps(reply_obj, indent=4)
@@ -243,14 +294,10 @@ def analyse_resume(txt_resume: str, temperature: float) -> str:
 
 def precondition_msg(msg):
     """
-    Iterate over the valid fields, and creates a new dictionary with only the \
-    valid fields from the input msg dictionary, and returns it as output.
+    Creates a new dictionary with only the valid fields, role and content, \
+    from the input msg dictionary, and returns it as output.
     """
-    valid_fields = ["role", "content"]
-    out = {}
-    for field in valid_fields:
-        out[field] = msg[field]
-    return out
+    return {"role": msg["role"], "content": msg["content"]}
 
 
 def query_gpt(temperature: float) -> None:
@@ -276,13 +323,14 @@ def query_gpt(temperature: float) -> None:
     None
 
     """
-    messages = []
-    for msg in st.session_state["messages"]:
-        if msg["select"]:
-            messages.append(precondition_msg(msg))
+    messages = [
+        precondition_msg(msg)
+        for msg in st.session_state["messages"]
+        if msg["select"]
+    ]
     reply = call_openai_api(messages, temperature=temperature)
     msg = {
-        "id": str(uuid.uuid4()),
+        "id": get_message_id(),
         "select": True,
         "type": "reply",
         "role": "assistant",
@@ -291,68 +339,81 @@ def query_gpt(temperature: float) -> None:
     st.session_state["messages"].append(msg)
 
 
-@st.cache_data(show_spinner=False)
-def summary_job_description(txt_jd):
+@st.cache_resource(show_spinner=False)
+def summary_job_description(jd_digest, _txt_jd, model):
     """
-    Call GPT API to summary the job
+    Call GPT API to summary the job with the given model, which is part of \
+    the cache key together with the digest of the job description.
 
 
     Returns:
     A str representing the reply from GPT API
     """
     messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
+        SYSTEM_MSG,
         {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
+        {"role": "assistant", "content": _txt_jd},
         {"role": "user", "content": "Please summary the job description."},
-        {
-            "role": "user",
-            "content": "Please always surround the output \
-        with code tags by using the following syntax:",
-        },
-        {"role": "user", "content": "<code> Your message here </code>"},
+        *CODE_TAGS_MSGS,
     ]
-    reply = call_openai_api(messages, temperature=0.8)
+    reply = call_openai_api(
+        messages, temperature=0.8, model=model, persist=True
+    )
     return extract_code(reply)
 
 
-@st.cache_data(show_spinner=False)
-def estimate_match_rate(txt_jd: str, txt_resume: str) -> str:
+@st.cache_resource(show_spinner=False)
+def estimate_match_rate(
+    jd_digest: str,
+    resume_digest: str,
+    _txt_jd: str,
+    _txt_resume: str,
+    model: str,
+) -> str:
     """
-    Estimate the match rate between a job description and a resume using OpenAI's GPT API.
+    Estimate the match rate between a job description and a resume using \
+    OpenAI's GPT API.
 
     Parameters
     ----------
-    txt_jd : str
+    jd_digest : str
+        The digest of the job description, used as cache key.
+    resume_digest : str
+        The digest of the resume, used as cache key.
+    _txt_jd : str
         The text of the job description.
-    txt_resume : str
+    _txt_resume : str
         The text of the resume.
+    model : str
+        The name of the model to query, also part of the cache key.
 
     Returns
     -------
     str
-        The estimated match rate between the job description and the resume, as a string.
+        The estimated match rate between the job description and the \
+        resume, as a string.
 
     """
     messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
+        SYSTEM_MSG,
         {"role": "user", "content": "The job description is following:"},
-        {"role": "user", "content": txt_jd},
+        {"role": "user", "content": _txt_jd},
         {"role": "user", "content": "My resume is following:"},
-        {"role": "user", "content": txt_resume},
+        {"role": "user", "content": _txt_resume},
         {
             "role": "user",
             "content": "Can you help me estimate the match \
         rate between my experiences and this job description?",
         },
     ]
-    reply = call_openai_api(messages, temperature=0.5)
+    reply = call_openai_api(messages, temperature=0.5, model=model)
     return reply
 
 
 def generate_statements(words: int = 120, temperature: float = 0.8) -> list:
     """
-    Generates statements by calling OpenAI API using the provided session state parameters.
+    Generates statements by calling OpenAI API using the provided session \
+    state parameters.
 
     Parameters:
         words (int): The number of words for the generated statement. \
@@ -364,47 +425,14 @@ def generate_statements(words: int = 120, temperature: float = 0.8) -> list:
     Returns:
         replies (list): A list of replies generated by the OpenAI API.
     """
-    txt_jd = st.session_state["txt_jd"]
-    skills = st.session_state["skills"]
-    skills_str = ",".join(skills)
-    statement = st.session_state["statement"]
-    experiences_str = json.dumps(st.session_state["experiences"])
-
-    messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
-        {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
-        {
-            "role": "assistant",
-            "content": "Can you tell me about your skills and experiences?",
-        },
-        {"role": "user", "content": "I will give you my skills as following:"},
-        {"role": "user", "content": skills_str},
-        {
-            "role": "user",
-            "content": "I will give you my experiences as \
-        following:",
-        },
-        {"role": "user", "content": experiences_str},
-        {
-            "role": "user",
-            "content": "I will give you my personal statement \
-        as following:",
-        },
-        {"role": "user", "content": statement},
-        {
-            "role": "user",
-            "content": f"Can you write a new personal \
-        statement for me in {words} words, connecting my skills and \
-        experiences with the job description?",
-        },
-        {
-            "role": "user",
-            "content": "Please always surround the output \
-        with code tags by using the following syntax:",
-        },
-        {"role": "user", "content": "<code> Your message here </code>"},
-    ]
+    skills_str = ",".join(st.session_state["skills"])
+    messages = get_statement_msgs(
+        st.session_state["txt_jd"],
+        skills_str,
+        get_experiences_str(),
+        st.session_state["statement"],
+        words,
+    )
     replies = call_openai_api(
         messages, temperature=temperature, number_completion=3
     )
@@ -412,14 +440,17 @@ def generate_statements(words: int = 120, temperature: float = 0.8) -> list:
 
 
 @st.cache_data(show_spinner=False)
-def sort_skills(txt_jd: str, skills: str, temperature: float) -> str:
+def sort_skills(
+    jd_digest: str, _txt_jd: str, skills: str, temperature: float
+) -> str:
     """
     This function takes in two parameters the job description and the user's \
     skills. It then sends a series of messages to the OpenAI API to rank and \
     sort the user's skills based on their relevance to the job description.
 
     Parameters:
-    - txt_jd (str): The job description.
+    - jd_digest (str): The digest of the job description, used as cache key.
+    - _txt_jd (str): The job description.
     - skills (str): A string containing the user's skills.
     - temperature (float): Controls the randomness and creativity of output.
 
@@ -429,9 +460,9 @@ def sort_skills(txt_jd: str, skills: str, temperature: float) -> str:
     """
     skills_str = ",".join(skills)
     messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
+        SYSTEM_MSG,
         {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
+        {"role": "assistant", "content": _txt_jd},
         {"role": "user", "content": "I will give you my skills as following:"},
         {"role": "user", "content": skills_str},
         {
@@ -446,19 +477,16 @@ def sort_skills(txt_jd: str, skills: str, temperature: float) -> str:
             "content": "Please list the skills separated by \
         commas: skill1, skill2, skill3",
         },
-        {
-            "role": "user",
-            "content": "Please always surround the output with \
-        code tags by using the following syntax:",
-        },
-        {"role": "user", "content": "<code> Your message here </code>"},
+        *CODE_TAGS_MSGS,
         {
             "role": "user",
             "content": "This is an example of your final output: \
         <code> skill1, skill2, skill3 </code>",
         },
     ]
-    reply = call_openai_api(messages, temperature=temperature, model="gpt-4")
+    reply = call_openai_api(
+        messages, temperature=temperature, model="gpt-4", persist=True
+    )
     return reply
 
 
@@ -477,33 +505,7 @@ def generate_skills(number: int, temperature: float = 0.2) -> str:
         reply (str): Extracted skills separated by commas and enclosed in \
         '<code></code>'.
     """
-    txt_jd = st.session_state["txt_jd"]
-    messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
-        {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
-        {
-            "role": "user",
-            "content": f"From the job description, can you \
-        identify {number} specific keywords used by an ATS system?",
-        },
-        {
-            "role": "user",
-            "content": "Can you please list the keywords like \
-        keyword1, keyword2, and keyword3 separately using commas instead of \
-        'and' to join the last two keywords, and provide your response in a \
-        single paragraph?",
-        },
-        {
-            "role": "user",
-            "content": "Please always surround the output with \
-        code tags by using the following syntax:",
-        },
-        {
-            "role": "user",
-            "content": "<code>keyword1, keyword2, keyword3</code>",
-        },
-    ]
+    messages = get_skills_msgs(st.session_state["txt_jd"], number)
     reply = call_openai_api(messages, temperature=temperature)
     return reply
 
@@ -531,33 +533,7 @@ def generate_descriptions(
     Returns:
     a list of strings representing replies from OpenAI API
     """
-    txt_jd = st.session_state["txt_jd"]
-    messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
-        {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
-        {
-            "role": "user",
-            "content": f"Now I want to rewrite the project key \
-        description for project: {project['title']}.",
-        },
-        {
-            "role": "user",
-            "content": f"The project description is: \
-        {project['description']}.",
-        },
-        {
-            "role": "user",
-            "content": f"Can you rephrase the project \
-        description in {words} words, to align with the job description?",
-        },
-        {
-            "role": "user",
-            "content": "Please always surround the output with \
-        code tags by using the following syntax:",
-        },
-        {"role": "user", "content": "<code> Your message here </code>"},
-    ]
+    messages = get_description_msgs(st.session_state["txt_jd"], project, words)
     replies = call_openai_api(
         messages, temperature=temperature, number_completion=3
     )
@@ -582,59 +558,44 @@ def generate_contributions(project, words, number, temperature):
     replies (list): A list of key contributions generated by the GPT \
     model, aligned with the job description.
     """
-    txt_jd = st.session_state["txt_jd"]
-    contributions_str = "\n".join(project["contributions"])
-    messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
-        {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
-        {
-            "role": "user",
-            "content": f"Now I want to rewrite my key contributions for \
-            project: {project['title']}.",
-        },
-        {
-            "role": "user",
-            "content": f"The project description is: \
-        {project['description']}.",
-        },
-        {
-            "role": "user",
-            "content": "These are my key contributions \
-        for the project:",
-        },
-        {"role": "user", "content": contributions_str},
-        {
-            "role": "user",
-            "content": f"Can you analyse them and write \
-        {number} new key contributions in {words} words, to align with the \
-        job description?",
-        },
-        {
-            "role": "user",
-            "content": "Formatting the output as html in \
-        unordered list; identifying the keywords relevant with the job \
-        description.",
-        },
-        {
-            "role": "user",
-            "content": "Please always surround the keywords \
-        with bold tags by using the following syntax:",
-        },
-        {"role": "user", "content": "<b> keywords </b>"},
-        {
-            "role": "user",
-            "content": "Please always surround the output \
-        with code tags by using the following syntax:",
-        },
-        {"role": "user", "content": "<code> Your message here </code>"},
-    ]
+    messages = get_contribution_msgs(
+        st.session_state["txt_jd"], project, words, number
+    )
     replies = call_openai_api(
         messages, temperature=temperature, number_completion=3
     )
     return replies
 
 
+def get_motivation_msgs(index: int) -> list:
+    """
+    Builds the messages giving the job description, skills, experiences \
+    and the part of the motivation letter before the given paragraph.
+
+    Parameters:
+    index (int): The index of the paragraph to continue from.
+
+    Returns:
+    list: The messages to be followed by the writing instructions.
+    """
+    skills_str = ",".join(st.session_state["skills"])
+    previous_letter = "".join(
+        motivation["content"] + "\n"
+        for motivation in st.session_state["motivations"][:index]
+    )
+
+    return get_profile_msgs(
+        st.session_state["txt_jd"], skills_str, get_experiences_str()
+    ) + [
+        {
+            "role": "user",
+            "content": "I will give you my previous part of my \
+        motivation letter as following:",
+        },
+        {"role": "user", "content": previous_letter},
+    ]
+
+
 def create_motivation(index: int, config: dict) -> str:
     """Generates a paragraph for a motivation letter using OpenAI's GPT \
     and model.
@@ -647,50 +608,64 @@ def create_motivation(index: int, config: dict) -> str:
     Returns:
     str: The generated paragraph.
     """
-    txt_jd = st.session_state["txt_jd"]
-    skills = st.session_state["skills"]
-    skills_str = ",".join(skills)
-    experiences_str = json.dumps(st.session_state["experiences"])
-    previous_letter = ""
-    for i in range(index):
-        previous_letter += st.session_state["motivations"][i]["content"] + "\n"
-
-    messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
-        {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
-        {
-            "role": "assistant",
-            "content": "Can you tell me about your skills and experiences?",
-        },
-        {"role": "user", "content": "I will give you my skills as following:"},
-        {"role": "user", "content": skills_str},
+    messages = get_motivation_msgs(index) + [
         {
             "role": "user",
-            "content": "I will give you my experiences as \
-        following:",
+            "content": f"Please continue to write one paragraph \
+        in {config['words']} words, connecting my skills and experiences with \
+        the job description.",
         },
-        {"role": "user", "content": experiences_str},
         {
             "role": "user",
-            "content": "I will give you my previous part of my \
-        motivation letter as following:",
+            "content": f"Please write as a non-native English \
+        speaker at the {config['level']} level",
         },
-        {"role": "user", "content": previous_letter},
+    ]
+    reply = call_openai_api_stream(messages, temperature=config["temperature"])
+    return reply
+
+
+def create_motivations(index: int, number: int, config: dict) -> list:
+    """Generates several consecutive paragraphs for a motivation letter \
+    with a single request, instead of one request per paragraph.
+
+    Parameters:
+    index (int): The index of the first paragraph to generate.
+    number (int): The number of paragraphs to generate.
+    config (dict): A dictionary containing the words and temperature to be \
+    used in generating the paragraphs.
+
+    Returns:
+    list: The generated paragraphs, which may be fewer than requested if \
+    the reply is incomplete.
+    """
+    if number == 1:
+        reply = create_motivation(index, config)
+        return [] if reply is None else [reply]
+    labels = "".join(f"<p{i}>...</p{i}>" for i in range(1, number + 1))
+    messages = get_motivation_msgs(index) + [
         {
             "role": "user",
-            "content": f"Please continue to write one paragraph \
-        in {config['words']} words, connecting my skills and experiences with \
-        the job description.",
+            "content": f"Please continue to write {number} paragraphs, \
+        each in {config['words']} words, connecting my skills and experiences \
+        with the job description.",
         },
         {
             "role": "user",
             "content": f"Please write as a non-native English \
         speaker at the {config['level']} level",
         },
+        {
+            "role": "user",
+            "content": "Please surround each paragraph with its \
+        numbered tags by using the following syntax:",
+        },
+        {"role": "user", "content": labels},
     ]
     reply = call_openai_api(messages, temperature=config["temperature"])
-    return reply
+    if reply is None:
+        return []
+    return extract_numbered_paragraphs(reply)[:number]
 
 
 def revise_motivation(content, config):
@@ -708,27 +683,11 @@ def revise_motivation(content, config):
         reply
 
     """
-    txt_jd = st.session_state["txt_jd"]
-    skills = choose_skills()
-    skills_str = ",".join(skills)
-    experiences_str = json.dumps(choose_experiences())
-    messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
-        {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
-        {
-            "role": "assistant",
-            "content": "Can you tell me about your skills \
-        and experiences?",
-        },
-        {"role": "user", "content": "I will give you my skills as following:"},
-        {"role": "user", "content": skills_str},
-        {
-            "role": "user",
-            "content": "I will give you my experiences as \
-        following:",
-        },
-        {"role": "user", "content": experiences_str},
+    skills_str = ",".join(choose_skills())
+    experiences_str = encode_json(choose_experiences()).decode()
+    messages = get_profile_msgs(
+        st.session_state["txt_jd"], skills_str, experiences_str
+    ) + [
         {
             "role": "user",
             "content": "I will give you one paragraph of my \
@@ -750,7 +709,7 @@ def revise_motivation(content, config):
         speaker at the {config['level']} level",
         },
     ]
-    reply = call_openai_api(messages, temperature=config["temperature"])
+    reply = call_openai_api_stream(messages, temperature=config["temperature"])
     return reply
 
 
@@ -769,27 +728,12 @@ def revise_motivations(config: dict) -> str:
         reply
 
     """
-    txt_jd = st.session_state["txt_jd"]
-    skills = choose_skills()
-    skills_str = ",".join(skills)
-    experiences_str = json.dumps(choose_experiences())
+    skills_str = ",".join(choose_skills())
+    experiences_str = encode_json(choose_experiences()).decode()
     letter = st.session_state["letter"]
-    messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
-        {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": txt_jd},
-        {
-            "role": "assistant",
-            "content": "Can you tell me about your skills and experiences?",
-        },
-        {"role": "user", "content": "I will give you my skills as following:"},
-        {"role": "user", "content": skills_str},
-        {
-            "role": "user",
-            "content": "I will give you my experiences as \
-        following:",
-        },
-        {"role": "user", "content": experiences_str},
+    messages = get_profile_msgs(
+        st.session_state["txt_jd"], skills_str, experiences_str
+    ) + [
         {
             "role": "user",
             "content": "I will give you my motivation letter as \
@@ -812,7 +756,7 @@ def revise_motivations(config: dict) -> str:
         speaker at the {config['level']} level",
         },
     ]
-    reply = call_openai_api(messages, temperature=config["temperature"])
+    reply = call_openai_api_stream(messages, temperature=config["temperature"])
     return reply
 
 
@@ -833,28 +777,12 @@ def generate_motivations(config: dict) -> str:
     Returns:
         reply (str): A string of reply generated by the OpenAI API.
     """
-    job_description = choose_job_description()
-    skills = choose_skills()
-    skills_str = ",".join(skills)
-    experiences_str = json.dumps(choose_experiences())
+    skills_str = ",".join(choose_skills())
+    experiences_str = encode_json(choose_experiences()).decode()
     prompt = st.session_state["letter"]
-    messages = [
-        {"role": "system", "content": SYSTEM_ROLE},
-        {"role": "assistant", "content": "The job description is following:"},
-        {"role": "assistant", "content": job_description},
-        {
-            "role": "assistant",
-            "content": "Can you tell me about your skills and experiences?",
-        },
-        {"role": "user", "content": "I will give you my skills as following:"},
-        {"role": "user", "content": skills_str},
-        {
-            "role": "user",
-            "content": "I will give you my experiences as \
-        following:",
-        },
-        {"role": "user", "content": experiences_str},
-    ]
+    messages = get_profile_msgs(
+        choose_job_description(), skills_str, experiences_str
+    )
     if len(prompt) > 0:
         messages += [
             {"role": "user", "content": f"According to the prompt: {prompt}"}
@@ -872,10 +800,29 @@ def generate_motivations(config: dict) -> str:
         speaker at the {config['level']} level",
         },
     ]
-    reply = call_openai_api(messages, temperature=config["temperature"])
+    reply = call_openai_api_stream(messages, temperature=config["temperature"])
     return reply
 
 
+def get_experiences_str() -> str:
+    """
+    Returns the experiences of the session serialised as JSON. The string \
+    is kept in the session state and only serialised again when the \
+    experiences are replaced or edited, which bumps experiences_version.
+
+    Returns:
+    str: The experiences as a JSON string.
+    """
+    experiences = st.session_state["experiences"]
+    version = st.session_state["experiences_version"]
+    cached = st.session_state.get("experiences_json")
+    # holding the list itself keeps its id from being reused
+    if cached is None or cached[0] is not experiences or cached[1] != version:
+        cached = (experiences, version, encode_json(experiences).decode())
+        st.session_state["experiences_json"] = cached
+    return cached[2]
+
+
 def get_system_msg(system_role: str) -> list:
     """
     Takes a system_role parameter. It returns a list of a single dictionary \
@@ -895,7 +842,7 @@ def get_system_msg(system_role: str) -> list:
     """
     system_msg = [
         {
-            "id": str(uuid.uuid4()),
+            "id": get_message_id(),
             "select": True,
             "type": "system",
             "role": "system",
@@ -929,11 +876,14 @@ def get_job_description_msg() -> Union[dict, None]:
         return None
     jd_msg = [
         {
-            "id": str(uuid.uuid4()),
+            "id": get_message_id(),
             "select": True,
             "type": "info",
             "role": "user",
-            "content": f"The job description is follows: \n{st.session_state['txt_jd']}",
+            "content": (
+                "The job description is follows: \n"
+                f"{st.session_state['txt_jd']}"
+            ),
         },
     ]
     return jd_msg
@@ -948,16 +898,18 @@ def get_skills_msg() -> Union[dict, None]:
     is empty, return None
     """
     skills = choose_skills()
-    if len(skills) == 0:
+    if not skills:
         return None
     skills_str = ", ".join(skills)
     skills_msg = [
         {
-            "id": str(uuid.uuid4()),
+            "id": get_message_id(),
             "select": True,
             "type": "info",
             "role": "user",
-            "content": f"I will give you my skills as follows: \n {skills_str}",
+            "content": (
+                f"I will give you my skills as follows: \n {skills_str}"
+            ),
         },
     ]
     return skills_msg
@@ -968,19 +920,23 @@ def get_experiences_msg() -> Union[dict, None]:
     Returns a list containing a single dictionary object. The dictionary \
     object contains keys "select", "type", "role", and "content" with their \
     corresponding values. The purpose of this function is to generate a \
-    message that informs the user of the current selected experiences.
+    message that informs the user of the current selected experiences. If \
+    there is none, return None
     """
     experiences = choose_experiences()
-    if experiences is None:
+    if not experiences:
         return None
-    experiences_str = json.dumps(experiences)
+    experiences_str = encode_json(experiences).decode()
     experiences_msg = [
         {
-            "id": str(uuid.uuid4()),
+            "id": get_message_id(),
             "select": True,
             "type": "info",
             "role": "user",
-            "content": f"I will give you my experiences as follows: \n{experiences_str}",
+            "content": (
+                "I will give you my experiences as follows: \n"
+                f"{experiences_str}"
+            ),
         },
     ]
     return experiences_msg
@@ -2,12 +2,36 @@
 This module includes token functions for the GPT-3 API.
 """
 
+from functools import lru_cache
 import tiktoken
 
+# tokens added per message and per name by the counted message formats
+MESSAGE_FORMATS = {
+    "gpt-3.5-turbo-0301": (4, -1),  # if there's a name, the role is omitted
+    "gpt-4-0314": (3, 1),
+}
+
+
+@lru_cache(maxsize=8)
+def get_encoding(model: str) -> tiktoken.Encoding:
+    """Returns the encoding of a model, loading its BPE ranks only once."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def resolve_model(model: str) -> str:
+    """Returns the message format counted for a model."""
+    if "gpt-3.5-turbo" in model:
+        return "gpt-3.5-turbo-0301"
+    # gpt-4 variants and unknown models are counted like gpt-4
+    return "gpt-4-0314"
+
 
 def num_tokens_from_string(string: str, encoding_name: str) -> int:
     """Returns the number of tokens in a text string."""
-    encoding = tiktoken.encoding_for_model(encoding_name)
+    encoding = get_encoding(encoding_name)
     num_tokens = len(encoding.encode(string))
     return num_tokens
 
@@ -16,29 +40,16 @@ def num_tokens_from_messages(
     messages: list, model: str = "gpt-3.5-turbo-0301"
 ) -> int:
     """Returns the number of tokens used by a list of messages."""
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")
-    if "gpt-3.5-turbo" in model and model != "gpt-3.5-turbo-0301":
-        return num_tokens_from_messages(messages, model="gpt-3.5-turbo-0301")
-    if "gpt-4" in model and model != "gpt-4-0314":
-        return num_tokens_from_messages(messages, model="gpt-4-0314")
-    if model == "gpt-3.5-turbo-0301":
-        # every message follows <|start|>{role/name}\n{content}<|end|>\n
-        tokens_per_message = 4
-        tokens_per_name = -1  # if there's a name, the role is omitted
-    elif model == "gpt-4-0314":
-        tokens_per_message = 3
-        tokens_per_name = 1
-    else:
-        return num_tokens_from_messages(messages, model="gpt-4")
-    num_tokens = 0
-    for message in messages:
-        num_tokens += tokens_per_message
-        for key, value in message.items():
-            num_tokens += len(encoding.encode(value))
-            if key == "name":
-                num_tokens += tokens_per_name
+    model = resolve_model(model)
+    encoding = get_encoding(model)
+    tokens_per_message, tokens_per_name = MESSAGE_FORMATS[model]
+    # one call encodes every value instead of one call per value
+    values = [value for message in messages for value in message.values()]
+    num_tokens = sum(map(len, encoding.encode_ordinary_batch(values)))
+    # every message follows <|start|>{role/name}\n{content}<|end|>\n
+    num_tokens += tokens_per_message * len(messages)
+    num_tokens += tokens_per_name * sum(
+        "name" in message for message in messages
+    )
     num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
     return num_tokens
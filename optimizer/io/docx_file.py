@@ -3,13 +3,37 @@ This module provides functions to create a Word document from a given \
 template. The main function is `to_docx` which creates a Word document from \
 a given template , and replaces placeholders with the corresponding parameters
 """
+from functools import lru_cache
 from io import BytesIO
 import copy
 import re
+import zipfile
 from docx import Document
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT, WD_LINE_SPACING
 from docx.shared import Pt, Inches
-from simplify_docx import simplify
+from docx.text.font import Font
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+_W_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_TEXT_TAG = f"{_W_NAMESPACE}t"
+
+_PARAGRAPH_TAG = f"{_W_NAMESPACE}p"
+
+# the body paragraphs whose whole text is a placeholder
+_PLACEHOLDER_XPATH = "./w:p[{}]".format(
+    " or ".join(
+        f'. = "{field}"'
+        for field in ("{statement}", "{competencies}", "{experiences}")
+    )
+)
+
+# font size of the generated resume content
+_FONT_SIZE = Pt(11)
+
+# space between the company name and the date range
+_COMPANY_PADDING = "   "
 
 
 def move_table_after(table, paragraph):
@@ -63,7 +87,6 @@ def create_project_name(doc, proj):
     """
     para = doc.add_paragraph()
     para.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-    para.style.font.size = Pt(11)
     para.add_run("Project: ").bold = True
     para.add_run(proj["title"])
     para.paragraph_format.space_after = Pt(0)
@@ -85,7 +108,6 @@ def create_project_description(doc, proj):
     para = doc.add_paragraph()
     para.add_run(proj["description"]).italic = True
     para.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-    para.style.font.size = Pt(11)
     para.paragraph_format.space_after = Pt(0)
     para.paragraph_format.line_spacing = 1.15
     return para
@@ -107,11 +129,13 @@ def create_contribution_head(doc):
     run_head.italic = True
     run_head.bold = True
     para.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-    para.style.font.size = Pt(11)
     para.paragraph_format.space_after = Pt(0)
     return para
 
 
+BOLD_TAG_PATTERN = re.compile(r"(</?b>)")
+
+
 def render_contribution(para, contribution):
     """
     Renders a contribution onto a paragraph object. A contribution is a \
@@ -132,22 +156,24 @@ def render_contribution(para, contribution):
         ValueError: If the number of `<b>` tags does not match the number of \
         `</b>` tags.
     """
-    left_bold = [m.start() for m in re.finditer("<b>", contribution)]
-    right_bold = [m.start() for m in re.finditer("</b>", contribution)]
-    start = 0
-    if len(left_bold) != len(right_bold):
+    opened = contribution.count("<b>")
+    if opened != contribution.count("</b>"):
         raise ValueError("tag open and close not matched")
-    if len(left_bold) == 0:
+    if opened == 0:
         para.add_run(contribution)
         return
-
-    for left, right in zip(left_bold, right_bold):
-        if start < left:
-            para.add_run(contribution[start:left])
-        para.add_run(contribution[left + 3 : right]).bold = True
-        start = right + 4
-    if right_bold[-1] < len(contribution):
-        para.add_run(contribution[right_bold[-1] + 4 :])
+    parts = BOLD_TAG_PATTERN.split(contribution)
+    # the tags are at the odd indices, between the text segments
+    bold = False
+    for index, part in enumerate(parts):
+        if index % 2 == 1:
+            if bold == (part == "<b>"):
+                raise ValueError("tag open and close not matched")
+            bold = not bold
+        elif part:
+            run = para.add_run(part)
+            if bold:
+                run.bold = True
 
 
 def add_bullet_point(para):
@@ -165,8 +191,6 @@ def add_bullet_point(para):
     para.paragraph_format.left_indent = Inches(0.5)
     para.paragraph_format.first_line_indent = Inches(-0.25)
     para.paragraph_format.tab_stops.add_tab_stop(Inches(0.5))
-    # Replace 'Symbol' with the desired font
-    para.style.font.name = "Times New Roman"
     para.text = "\u25CF    " + para.text  # Prepend bullet point character
 
 
@@ -185,7 +209,6 @@ def create_contribution(doc, contribution):
     add_bullet_point(para)
     render_contribution(para, contribution)
     para.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-    para.style.font.size = Pt(11)
     para.paragraph_format.space_before = Pt(0)
     para.paragraph_format.space_after = Pt(0)
     para.paragraph_format.line_spacing = 1.15
@@ -204,9 +227,14 @@ def create_contributions(doc, proj):
     list: A list of paragraphs representing the contributions added to the \
     document.
     """
-    paras = []
-    for contribution in proj["contributions"]:
-        paras.append(create_contribution(doc, contribution))
+    paras = [
+        create_contribution(doc, contribution)
+        for contribution in proj["contributions"]
+    ]
+    # the bullets share one paragraph style, so its font is set only once;
+    # replace 'Symbol' with the desired font
+    if len(paras) > 0:
+        paras[0].style.font.name = "Times New Roman"
     return paras
 
 
@@ -221,11 +249,12 @@ def create_project(doc, proj):
     Returns:
         list: A list of paragraphs describing the project.
     """
-    paras = []
-    paras.append(create_project_name(doc, proj))
-    paras.append(create_project_description(doc, proj))
-    paras.append(create_contribution_head(doc))
-    paras += create_contributions(doc, proj)
+    paras = [
+        create_project_name(doc, proj),
+        create_project_description(doc, proj),
+        create_contribution_head(doc),
+    ]
+    paras.extend(create_contributions(doc, proj))
     return paras
 
 
@@ -246,11 +275,9 @@ def create_projects(doc, exp):
     Returns:
         A list of paragraph elements to be added to the given document.
     """
-    paras = []
-    for proj in exp["projects"]:
-        paras += create_project(doc, proj)
-
-    return paras
+    return [
+        para for proj in exp["projects"] for para in create_project(doc, proj)
+    ]
 
 
 def create_company(doc, exp):
@@ -275,42 +302,65 @@ def create_company(doc, exp):
     para : Paragraph
         The created paragraph.
     """
-    str_range = f"({exp['date_range']})"
     para = doc.add_paragraph()
     para.add_run(exp["title"]).bold = True
     para.add_run(" at ")
     para.add_run(exp["company"])
-    padding = " " * round(3)
-    para.add_run(padding)
-    para.add_run(str_range)
+    para.add_run(_COMPANY_PADDING)
+    para.add_run(f"({exp['date_range']})")
     para.paragraph_format.space_before = Pt(9)
     para.paragraph_format.space_after = Pt(0)
     return para
 
 
-def write_experiences(doc, para, experiences):
+class ParagraphInserter:
+    """
+    Stands in for a document in the paragraph creators, adding every new \
+    paragraph right before a given paragraph instead of at the end of the \
+    document body.
+
+    Args:
+        paragraph (docx.text.paragraph.Paragraph): The paragraph before \
+        which the new paragraphs are inserted.
+    """
+
+    def __init__(self, paragraph):
+        self.paragraph = paragraph
+
+    def add_paragraph(self, text="", style=None):
+        """
+        Inserts a new paragraph before the wrapped paragraph.
+
+        Returns:
+            docx.text.paragraph.Paragraph: The inserted paragraph.
+        """
+        return self.paragraph.insert_paragraph_before(text, style)
+
+
+def write_experiences(para, experiences):
     """
-    Insert a list of experiences under a given paragraph in a Word document.
+    Replace a given paragraph in a Word document with a list of experiences.
 
     Parameters:
-        doc (docx.Document): The document to insert the experiences into.
-        para (docx.Paragraph): The paragraph to insert the experiences under.
+        para (docx.Paragraph): The paragraph to replace with the experiences.
         experiences (dict): A dictionary containing experience data.
 
     Returns:
-        None
+        list: The paragraphs inserted in place of the given paragraph.
     """
-    para_placeholder = para
+    # create the paragraphs in place, so they do not have to be appended to
+    # the end of the body and moved afterwards
+    inserter = ParagraphInserter(para)
     paragraphs = []
     for exp in experiences:
-        para = create_company(doc, exp)
-        para_projects = create_projects(doc, exp)
-        paragraphs.append(para)
-        paragraphs += para_projects
-
-    for paragraph in paragraphs[::-1]:
-        move_paragraph_after(para_placeholder, paragraph)
-    delete_paragraph(para_placeholder)
+        paragraphs.append(create_company(inserter, exp))
+        paragraphs += create_projects(inserter, exp)
+    delete_paragraph(para)
+    # the new paragraphs share the default paragraph style, so its font size
+    # is set once instead of by every paragraph creator
+    if len(paragraphs) > 0:
+        paragraphs[0].style.font.size = _FONT_SIZE
+    return paragraphs
 
 
 def set_paragraph_font_name(para, name):
@@ -326,7 +376,43 @@ def set_paragraph_font_name(para, name):
     None
     """
     for run in para.runs:
-        run.font.name = name
+        # the setter rewrites the run properties even for the same font
+        if run.font.name != name:
+            run.font.name = name
+
+
+def set_body_font_name(doc, name):
+    """
+    Sets the font name for all runs of the paragraphs at the top level of \
+    the document body, the paragraphs listed by `doc.paragraphs`.
+
+    Parameters:
+    doc (docx.Document): The document whose font name is to be set.
+    name (str): The name of the font to be set.
+
+    Returns:
+    None
+    """
+    for run in doc.element.body.xpath("./w:p/w:r"):
+        font = Font(run)
+        # the setter rewrites the run properties even for the same font
+        if font.name != name:
+            font.name = name
+
+
+@lru_cache(maxsize=4)
+def load_template(bytes_data):
+    """
+    Parses a Word document once per distinct bytes. The cached document is \
+    shared, so it is never modified nor read: create_docx hands out copies.
+
+    Args:
+        bytes_data (bytes): The raw bytes representing the Word document.
+
+    Returns:
+        docx.Document: The parsed document.
+    """
+    return Document(BytesIO(bytes_data))
 
 
 def create_docx(bytes_data):
@@ -340,7 +426,8 @@ def create_docx(bytes_data):
         docx.Document: A new `docx.Document` object constructed from the given bytes.
 
     """
-    return Document(BytesIO(copy.deepcopy(bytes_data)))
+    # copying the parsed XML trees is cheaper than unzipping and parsing
+    return copy.deepcopy(load_template(bytes_data))
 
 
 def validate_template(bytes_data, template_fields):
@@ -348,7 +435,7 @@ def validate_template(bytes_data, template_fields):
     Given a byte stream of a docx file as bytes_data and a list of
     strings representing template fields as template_fields, this
     function checks if all template fields are present in the docx
-    file. If a template field is found, it is removed from the list
+    file. If a template field is found, it is removed from the set
     of targets until all targets have been found or not.
 
     Args:
@@ -359,13 +446,14 @@ def validate_template(bytes_data, template_fields):
     - a list of strings representing the unfound template fields,
       which will be an empty list if all targets have been found.
     """
-    targets = copy.deepcopy(template_fields)
+    remaining = set(template_fields)
     doc = create_docx(bytes_data)
     for para in doc.paragraphs:
-        if para.text in targets:
-            targets.remove(para.text)
+        remaining.discard(para.text)
+        if len(remaining) == 0:
+            break
 
-    return targets
+    return [field for field in template_fields if field in remaining]
 
 
 def write_letter(letter, new_font_name="Times New Roman"):
@@ -390,8 +478,8 @@ def write_letter(letter, new_font_name="Times New Roman"):
     para.style.font.size = Pt(12)
     para.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
     para.paragraph_format.line_spacing = 1.15
-    for para in doc.paragraphs:
-        set_paragraph_font_name(para, new_font_name)
+    # the letter is the only paragraph with runs, so the body is not walked
+    set_paragraph_font_name(para, new_font_name)
     file_stream = BytesIO()
     doc.save(file_stream)
     file_stream.seek(0)
@@ -421,25 +509,27 @@ def to_docx(
         bytes: The bytes representation of the .docx file.
     """
     doc = create_docx(bytes_data)
-    for para in doc.paragraphs:
-        if para.text == "{statement}":
-            para.text = statement.strip()
-            para.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-            para.style.font.size = Pt(11)
-            para.paragraph_format.line_spacing = 1.15
-
-        if para.text == "{competencies}":
-            para.text = skills_str.strip()
+    # the placeholders replaced by a single left-aligned paragraph
+    replacements = {
+        "{statement}": statement,
+        "{competencies}": skills_str,
+    }
+    # only the placeholder paragraphs are wrapped, instead of building the
+    # text of every paragraph in Python to compare it
+    for p in doc.element.body.xpath(_PLACEHOLDER_XPATH):
+        para = Paragraph(p, doc._body)
+        text = para.text
+        if text in replacements:
+            para.text = replacements[text].strip()
             para.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-            para.style.font.size = Pt(11)
+            para.style.font.size = _FONT_SIZE
             para.paragraph_format.line_spacing = 1.15
-
-        if para.text == "{experiences}":
-            write_experiences(doc, para, experiences)
+        elif text == "{experiences}":
+            # the placeholder is replaced by the new paragraphs
+            write_experiences(para, experiences)
 
     if new_font_name is not None:
-        for para in doc.paragraphs:
-            set_paragraph_font_name(para, new_font_name)
+        set_body_font_name(doc, new_font_name)
 
     file_stream = BytesIO()
     doc.save(file_stream)
@@ -447,39 +537,34 @@ def to_docx(
     return file_stream.read()
 
 
-def extract_text_from_docx(doc):
+def extract_text_from_docx(source):
     """
-    Extracts plain text from a docx file.
+    Extracts plain text from the main part of a docx file. The XML is \
+    parsed incrementally and every paragraph is cleared once read, so the \
+    memory use does not grow with the size of the document.
 
     Args:
-        doc: The docx file to extract plain text from.
+        source: The file-like object of the `word/document.xml` part.
 
     Returns:
-        A string containing the plain text extracted from the docx file.
-    """
-
-    def extract_text(json_obj):
-        text = []
-
-        if isinstance(json_obj, dict):
-            obj_type = json_obj.get("TYPE", "")
-            obj_value = json_obj.get("VALUE", [])
-
-            if obj_type == "text":
-                text.append(obj_value)
-            elif isinstance(obj_value, (list, dict)):
-                text.extend(extract_text(obj_value))
-
-        elif isinstance(json_obj, list):
-            for item in json_obj:
-                text.extend(extract_text(item))
-
-        return text
-
-    json_obj = simplify(doc)
-    result = extract_text(json_obj)
-    text = "\n".join(result)
-    return text
+        A string containing the text of the document, one paragraph per \
+        line. The runs of a paragraph are joined without a separator.
+    """
+    text = []
+    runs = []
+    for _, elem in etree.iterparse(
+        source, events=("end",), tag=(_TEXT_TAG, _PARAGRAPH_TAG)
+    ):
+        if elem.tag == _TEXT_TAG:
+            if elem.text:
+                runs.append(elem.text)
+        else:
+            text.append("".join(runs))
+            runs.clear()
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    return "\n".join(text)
 
 
 def docx_to_text(bytes_data):
@@ -495,6 +580,6 @@ def docx_to_text(bytes_data):
     Returns:
     str: A string that contains the plain text content of the input docx file.
     """
-    doc = create_docx(bytes_data)
-    result = extract_text_from_docx(doc)
-    return result
+    with zipfile.ZipFile(BytesIO(bytes_data)) as archive:
+        with archive.open("word/document.xml") as source:
+            return extract_text_from_docx(source)
@@ -2,11 +2,33 @@
 This module provides functions to retrieve job information from LinkedIn \
 using the proxycurl API.
 """
+from functools import lru_cache
 from dotenv import dotenv_values
 import requests
 import streamlit as st
 from optimizer.utils.web import retry
 
+PROXYCURL_JOB_URL = "https://nubela.co/proxycurl/api/linkedin/job"
+
+
+@lru_cache(maxsize=1)
+def get_proxycurl_session():
+    """
+    Returns a shared HTTP session for the proxycurl API. The .env file is \
+    only read on the first call, and the session keeps its connection \
+    alive, so consecutive requests and retries skip the TCP and TLS \
+    handshakes.
+
+    Returns:
+        requests.Session: The session with the authorization header set.
+    """
+    config = dotenv_values(".env")
+    session = requests.Session()
+    session.headers.update(
+        {"Authorization": "Bearer " + config["PROXYCURL_API_KEY"]}
+    )
+    return session
+
 
 @st.cache_data(show_spinner=False)
 @retry(requests.exceptions.Timeout, tries=5, delay=1, backoff=2, max_delay=120)
@@ -19,15 +41,11 @@ def call_proxycurl_api(job_id: str) -> requests.Response:
     Returns:
         requests.Response: HTTP response object
     """
-    config = dotenv_values(".env")
-    proxycurl_api_key = config["PROXYCURL_API_KEY"]
-    api_endpoint = "https://nubela.co/proxycurl/api/linkedin/job"
-    header_dic = {"Authorization": "Bearer " + proxycurl_api_key}
     params = {
         "url": f"https://www.linkedin.com/jobs/view/{job_id}/",
     }
-    response = requests.get(
-        api_endpoint, params=params, headers=header_dic, timeout=(300, 600)
+    response = get_proxycurl_session().get(
+        PROXYCURL_JOB_URL, params=params, timeout=(300, 600)
     )
 
     return response
@@ -6,6 +6,7 @@ the job description from a LinkedIn job posting.
 from optimizer.proxycurl.api import call_proxycurl_api
 from optimizer.utils.extract import extract_linkedin_job_id
 from optimizer.utils.parser import parse_linkedin_job_description
+from optimizer.utils.web import map_concurrently
 
 
 def scrap_job_description(url):
@@ -24,3 +25,19 @@ def scrap_job_description(url):
     page = call_proxycurl_api(job_id)
     scrapped_text = parse_linkedin_job_description(page)
     return scrapped_text
+
+
+def scrap_job_descriptions(urls, max_workers=8):
+    """
+    Scrapes the job descriptions of several LinkedIn job postings \
+    concurrently, as each one waits on its own proxycurl request.
+
+    Args:
+    urls (list): The URLs of the job postings.
+    max_workers (int): The maximum number of concurrent requests.
+
+    Returns:
+    list: The job descriptions in the order of the URLs, None for the URLs \
+    without a job ID.
+    """
+    return map_concurrently(scrap_job_description, urls, max_workers)
@@ -6,7 +6,6 @@ import streamlit as st
 from optimizer.gpt.api import call_openai_api
 
 
-@st.cache_data(show_spinner=False)
 def send_test_message():
     """
     Sends a test message to a OpenAI API model.
@@ -18,7 +17,7 @@ def send_test_message():
     test_messages = [
         {"role": "user", "content": "Tell me who you are."},
     ]
-    return call_openai_api(model, test_messages)
+    return call_openai_api(test_messages, model=model)
 
 
 def test_api():
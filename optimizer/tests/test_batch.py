@@ -0,0 +1,172 @@
+"""Unit tests for batch.py."""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from optimizer.gpt import batch
+
+
+def make_response(json_obj=None, text=""):
+    """Returns a fake HTTP response with the given JSON body or text."""
+    response = MagicMock()
+    response.json.return_value = json_obj
+    response.text = text
+    return response
+
+
+def make_body(content):
+    """Returns the decoded body of a chat completion with one choice."""
+    return {
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1},
+        "choices": [
+            {"finish_reason": "stop", "message": {"content": content}}
+        ],
+    }
+
+
+class TestBuildBatchRequest(unittest.TestCase):
+    """Unit tests for build_batch_request."""
+
+    def test_request_body(self):
+        """Test that the request targets chat completions with the body."""
+        messages = [
+            {"role": "system", "content": "You are my coach."},
+            {"role": "user", "content": "Hello"},
+            {"role": "user", "content": "World"},
+        ]
+        request = batch.build_batch_request(
+            messages, temperature=0.5, number_completion=3, model="gpt-4o"
+        )
+        self.assertEqual(request["method"], "POST")
+        self.assertEqual(request["url"], "/v1/chat/completions")
+        self.assertEqual(
+            request["body"],
+            {
+                "model": "gpt-4o",
+                "messages": [
+                    {"role": "system", "content": "You are my coach."},
+                    {"role": "user", "content": "Hello\nWorld"},
+                ],
+                "temperature": 0.5,
+                "n": 3,
+            },
+        )
+
+    def test_unique_custom_ids(self):
+        """Test that every request gets its own custom id."""
+        messages = [{"role": "user", "content": "Hello"}]
+        first = batch.build_batch_request(messages, model="gpt-4o")
+        second = batch.build_batch_request(messages, model="gpt-4o")
+        self.assertNotEqual(first["custom_id"], second["custom_id"])
+
+
+@patch("optimizer.gpt.batch.get_openai_session")
+class TestSubmitBatch(unittest.TestCase):
+    """Unit tests for submit_batch."""
+
+    def test_uploads_jsonl(self, mock_session):
+        """Test that the requests are uploaded as one JSON line each."""
+        mock_session.return_value.post.side_effect = [
+            make_response({"id": "file1"}),
+            make_response({"id": "batch1"}),
+        ]
+        requests = [
+            batch.build_batch_request(
+                [{"role": "user", "content": content}], model="gpt-4o"
+            )
+            for content in ("one", "two")
+        ]
+        self.assertEqual(batch.submit_batch(requests), "batch1")
+        upload, create = mock_session.return_value.post.call_args_list
+        jsonl = upload.kwargs["files"]["file"][1]
+        self.assertEqual(
+            [json.loads(line) for line in jsonl.splitlines()], requests
+        )
+        self.assertEqual(
+            json.loads(create.kwargs["data"])["input_file_id"], "file1"
+        )
+
+
+@patch("optimizer.gpt.batch.time.sleep")
+@patch("optimizer.gpt.batch.get_openai_session")
+class TestWaitForBatch(unittest.TestCase):
+    """Unit tests for wait_for_batch."""
+
+    def test_completed(self, mock_session, mock_sleep):
+        """Test that the results are read once the batch completes."""
+        lines = [
+            {"custom_id": "a", "response": {"body": make_body("one")}},
+            {"custom_id": "b", "response": None},
+            {"custom_id": "c", "response": {"body": make_body("three")}},
+        ]
+        mock_session.return_value.get.side_effect = [
+            make_response({"status": "in_progress"}),
+            make_response({"status": "completed", "output_file_id": "f1"}),
+            make_response(text="\n".join(json.dumps(x) for x in lines)),
+        ]
+        results = batch.wait_for_batch("batch1", interval=5)
+        self.assertEqual(
+            results, {"a": make_body("one"), "c": make_body("three")}
+        )
+        mock_sleep.assert_called_once_with(5)
+        self.assertTrue(
+            mock_session.return_value.get.call_args.args[0].endswith(
+                "/files/f1/content"
+            )
+        )
+
+    def test_failed(self, mock_session, mock_sleep):
+        """Test that a failed batch has no results."""
+        mock_session.return_value.get.side_effect = [
+            make_response({"status": "failed", "output_file_id": None}),
+        ]
+        self.assertIsNone(batch.wait_for_batch("batch1"))
+        mock_sleep.assert_not_called()
+        self.assertEqual(mock_session.return_value.get.call_count, 1)
+
+
+@patch("optimizer.gpt.api.add_usage", MagicMock())
+@patch("optimizer.gpt.batch.is_too_long", return_value=False)
+@patch("optimizer.gpt.batch.wait_for_batch")
+@patch("optimizer.gpt.batch.submit_batch", return_value="batch1")
+class TestCallOpenaiApiBatch(unittest.TestCase):
+    """Unit tests for call_openai_api_batch."""
+
+    def test_replies_follow_requests(self, mock_submit, mock_wait, _):
+        """Test that the replies are matched to their requests by id."""
+
+        def wait_for_batch(batch_id):
+            # the output file does not keep the order of the input file
+            requests = mock_submit.call_args.args[0]
+            return {
+                request["custom_id"]: make_body(
+                    request["body"]["messages"][0]["content"].upper()
+                )
+                for request in reversed(requests)
+            }
+
+        mock_wait.side_effect = wait_for_batch
+        messages_list = [
+            [{"role": "user", "content": content}]
+            for content in ("one", "two", "three")
+        ]
+        replies = batch.call_openai_api_batch(messages_list, model="gpt-4o")
+        self.assertEqual(replies, ["ONE", "TWO", "THREE"])
+        mock_wait.assert_called_once_with("batch1")
+
+    def test_missing_result(self, mock_submit, mock_wait, _):
+        """Test that a request without a result gets None."""
+        mock_wait.side_effect = lambda batch_id: {
+            mock_submit.call_args.args[0][0]["custom_id"]: make_body("one")
+        }
+        messages_list = [
+            [{"role": "user", "content": content}]
+            for content in ("one", "two")
+        ]
+        replies = batch.call_openai_api_batch(messages_list, model="gpt-4o")
+        self.assertEqual(replies, ["one", None])
+
+
+if __name__ == "__main__":
+    unittest.main()
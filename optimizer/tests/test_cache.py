@@ -0,0 +1,100 @@
+"""Unit tests for cache.py."""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from optimizer.gpt import cache
+
+
+class TestReplyCache(unittest.TestCase):
+    """Unit tests for the persistent reply cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp_dir.name, "replies.sqlite3")
+        for patcher in (
+            patch.object(cache, "CACHE_PATH", path),
+            patch.object(cache, "is_cache_enabled", return_value=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        cache.get_connection.cache_clear()
+
+    def tearDown(self):
+        cache.get_connection().close()
+        cache.get_connection.cache_clear()
+        self.tmp_dir.cleanup()
+
+    def test_miss(self):
+        """Test that an unknown request has no cached reply."""
+        self.assertIsNone(cache.get_cached_reply(b'{"n": 1}'))
+
+    def test_store_and_get(self):
+        """Test that a stored reply is returned for the same body only."""
+        cache.store_reply(b'{"n": 3}', ["one", "two", "three"])
+        self.assertEqual(
+            cache.get_cached_reply(b'{"n": 3}'), ["one", "two", "three"]
+        )
+        self.assertIsNone(cache.get_cached_reply(b'{"n": 1}'))
+
+    @patch("optimizer.gpt.cache.time.time")
+    def test_stale_replies_pruned(self, mock_time):
+        """Test that replies older than CACHE_MAX_AGE are dropped."""
+        mock_time.return_value = 1000.0
+        cache.store_reply(b'{"n": 1}', "old")
+        mock_time.return_value += cache.CACHE_MAX_AGE + 1
+        self.assertIsNone(cache.get_cached_reply(b'{"n": 1}'))
+        cache.store_reply(b'{"n": 2}', "new")
+        count = cache.get_connection().execute("SELECT COUNT(*) FROM replies")
+        self.assertEqual(count.fetchone()[0], 1)
+
+    @patch("optimizer.gpt.cache.time.time")
+    def test_least_recent_pruned(self, mock_time):
+        """Test that at most CACHE_MAX_ROWS replies are kept."""
+        with patch.object(cache, "CACHE_MAX_ROWS", 2):
+            for i in range(3):
+                mock_time.return_value = 1000.0 + i
+                cache.store_reply(f'{{"n": {i}}}'.encode(), str(i))
+        self.assertIsNone(cache.get_cached_reply(b'{"n": 0}'))
+        self.assertEqual(cache.get_cached_reply(b'{"n": 1}'), "1")
+        self.assertEqual(cache.get_cached_reply(b'{"n": 2}'), "2")
+
+    def test_disabled(self):
+        """Test that nothing is stored or read when the cache is disabled."""
+        cache.store_reply(b'{"n": 1}', "one")
+        cache.is_cache_enabled.return_value = False
+        self.assertIsNone(cache.get_cached_reply(b'{"n": 1}'))
+        cache.store_reply(b'{"n": 2}', "two")
+        cache.is_cache_enabled.return_value = True
+        self.assertIsNone(cache.get_cached_reply(b'{"n": 2}'))
+
+
+class TestIsCacheEnabled(unittest.TestCase):
+    """Unit tests for is_cache_enabled."""
+
+    def setUp(self):
+        cache.is_cache_enabled.cache_clear()
+
+    def tearDown(self):
+        cache.is_cache_enabled.cache_clear()
+
+    @patch("optimizer.gpt.cache.dotenv_values", return_value={})
+    def test_default(self, _):
+        """Test that the cache is enabled by default."""
+        with patch.dict(os.environ):
+            os.environ.pop("REPLY_CACHE", None)
+            self.assertTrue(cache.is_cache_enabled())
+
+    @patch(
+        "optimizer.gpt.cache.dotenv_values",
+        return_value={"REPLY_CACHE": "1"},
+    )
+    def test_environment_overrides_config(self, _):
+        """Test that the environment takes precedence over the .env file."""
+        with patch.dict(os.environ, {"REPLY_CACHE": "off"}):
+            self.assertFalse(cache.is_cache_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
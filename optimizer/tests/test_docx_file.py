@@ -0,0 +1,38 @@
+"""Unit tests for docx_file.py."""
+
+from io import BytesIO
+import unittest
+import zipfile
+
+from optimizer.io.docx_file import docx_to_text
+
+DOCUMENT_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document \
+xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:body>
+<w:p><w:r><w:t>Senior </w:t></w:r><w:r><w:t>Engineer</w:t></w:r></w:p>
+<w:p><w:r><w:t>Python</w:t></w:r></w:p>
+</w:body>
+</w:document>
+"""
+
+
+def make_docx(document_xml):
+    """Returns the bytes of a docx file with the given main part."""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document_xml)
+    return buffer.getvalue()
+
+
+class TestDocxToText(unittest.TestCase):
+    """Unit tests for docx_to_text."""
+
+    def test_runs_joined_per_paragraph(self):
+        """Test that the runs of a paragraph are kept on one line."""
+        text = docx_to_text(make_docx(DOCUMENT_XML))
+        self.assertEqual(text, "Senior Engineer\nPython")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ from optimizer.utils.extract import (
     extract_by_quotation_mark,
     extract_code,
     extract_html_list,
+    extract_numbered_paragraphs,
 )
 
 
@@ -107,6 +108,12 @@ class TestExtractHTMLList(unittest.TestCase):
         expected_output = ["item1", "<strong>item2</strong>", "item3"]
         self.assertEqual(extract_html_list(content), expected_output)
 
+    def test_extract_html_list_with_attributes(self):
+        """Test that list items with attributes are extracted correctly."""
+        content = r'<ul><li class="item">item1</li><li>item2</li></ul>'
+        expected_output = ["item1", "item2"]
+        self.assertEqual(extract_html_list(content), expected_output)
+
     def test_extract_html_list_with_empty_content(self):
         """Test that html list with empty content returns None."""
         content = ""
@@ -152,5 +159,20 @@ class TestExtractVersionNumber(unittest.TestCase):
         )
 
 
+class TestExtractNumberedParagraphs(unittest.TestCase):
+    """Unit tests for extract_numbered_paragraphs."""
+
+    def test_paragraphs_in_number_order(self):
+        """Test that paragraphs are sorted by their labels."""
+        content = "Here:\n<p2> second </p2>\n<p1>first\nline</p1>"
+        self.assertEqual(
+            extract_numbered_paragraphs(content), ["first\nline", "second"]
+        )
+
+    def test_unmatched_tags_are_ignored(self):
+        """Test that a paragraph closed with another label is skipped."""
+        self.assertEqual(extract_numbered_paragraphs("<p1>text</p2>"), [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,51 @@
+"""Unit tests for prompts.py."""
+import unittest
+
+from optimizer.gpt.prompts import (
+    CODE_TAGS_MSGS,
+    SYSTEM_MSG,
+    get_contribution_msgs,
+    get_profile_msgs,
+    get_statement_msgs,
+)
+
+
+class TestPrompts(unittest.TestCase):
+    """Unit tests for the prompt builders."""
+
+    def test_profile_msgs(self):
+        """Test that the profile messages carry the given data."""
+        messages = get_profile_msgs("JD", "python,sql", "[]")
+        self.assertIs(messages[0], SYSTEM_MSG)
+        contents = [message["content"] for message in messages]
+        for value in ["JD", "python,sql", "[]"]:
+            self.assertIn(value, contents)
+
+    def test_statement_msgs(self):
+        """Test that the statement prompt ends with the code tags."""
+        messages = get_statement_msgs("JD", "python", "[]", "Hello", 80)
+        self.assertEqual(tuple(messages[-2:]), CODE_TAGS_MSGS)
+        self.assertIn("Hello", [message["content"] for message in messages])
+        self.assertIn("80 words", messages[-3]["content"])
+
+    def test_contribution_msgs(self):
+        """Test that the contributions are listed one per line."""
+        project = {
+            "title": "Parser",
+            "description": "A parser",
+            "contributions": ["Wrote it", "Tested it"],
+        }
+        messages = get_contribution_msgs("JD", project, 30, 4)
+        contents = [message["content"] for message in messages]
+        self.assertIn("Wrote it\nTested it", contents)
+
+    def test_static_messages_are_shared(self):
+        """Test that building a prompt does not change the shared messages."""
+        first = get_statement_msgs("JD", "python", "[]", "Hello", 80)
+        second = get_statement_msgs("JD", "python", "[]", "Hello", 80)
+        self.assertIs(first[0], second[0])
+        self.assertEqual(SYSTEM_MSG["role"], "system")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Unit tests for the rate limits in api.py."""
+
+import unittest
+from unittest.mock import patch
+
+from optimizer.gpt import api
+
+
+@patch("optimizer.gpt.api.dotenv_values")
+class TestGetRateLimits(unittest.TestCase):
+    """Unit tests for get_rate_limits."""
+
+    def test_defaults(self, mock_config):
+        """Test that the known models default to RATE_LIMITS."""
+        mock_config.return_value = {}
+        self.assertEqual(
+            api.get_rate_limits("gpt-4o"), api.RATE_LIMITS["gpt-4o"]
+        )
+
+    def test_config(self, mock_config):
+        """Test that the .env file overrides the defaults."""
+        mock_config.return_value = {
+            "GPT_4O_MINI_RPM": "60",
+            "GPT_4O_MINI_TPM": "",
+        }
+        self.assertEqual(
+            api.get_rate_limits("gpt-4o-mini"),
+            (60, api.RATE_LIMITS["gpt-4o-mini"][1]),
+        )
+
+    def test_unknown_model(self, mock_config):
+        """Test that a model without limits gets none."""
+        mock_config.return_value = {"GPT_3_5_TURBO_RPM": "60"}
+        self.assertIsNone(api.get_rate_limits("gpt-3.5-turbo"))
+
+
+@patch("optimizer.gpt.api.dotenv_values", return_value={})
+class TestGetRateLimiter(unittest.TestCase):
+    """Unit tests for get_rate_limiter."""
+
+    def setUp(self):
+        api.get_rate_limiter.cache_clear()
+
+    def tearDown(self):
+        api.get_rate_limiter.cache_clear()
+
+    def test_known_model(self, _):
+        """Test that a known model is rate limited."""
+        limiter = api.get_rate_limiter("gpt-4o")
+        self.assertIsInstance(limiter, api.RateLimiter)
+        self.assertIs(api.get_rate_limiter("gpt-4o"), limiter)
+
+    def test_unknown_model(self, _):
+        """Test that an unknown model does not block."""
+        limiter = api.get_rate_limiter("gpt-3.5-turbo")
+        self.assertIsInstance(limiter, api.UnlimitedRateLimiter)
+        limiter.acquire(10**9)
+
+
+if __name__ == "__main__":
+    unittest.main()
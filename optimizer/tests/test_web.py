@@ -0,0 +1,63 @@
+"""Unit tests for web.py."""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from optimizer.utils.web import map_concurrently, retry
+
+
+@patch("optimizer.utils.web.time.sleep")
+@patch("optimizer.utils.web.st", MagicMock())
+class TestRetry(unittest.TestCase):
+    """Unit tests for retry."""
+
+    def test_succeeds_after_failures(self, mock_sleep):
+        """Test that the function is retried until it succeeds."""
+        func = MagicMock(side_effect=[TimeoutError, TimeoutError, "done"])
+        wrapped = retry(TimeoutError, tries=5, delay=1, backoff=2)(func)
+        self.assertEqual(wrapped(), "done")
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(
+            [call.args[0] for call in mock_sleep.call_args_list], [1, 2]
+        )
+
+    def test_gives_up_after_tries(self, mock_sleep):
+        """Test that the last exception is raised after all tries."""
+        func = MagicMock(side_effect=TimeoutError)
+        wrapped = retry(TimeoutError, tries=3, delay=1, backoff=2)(func)
+        with self.assertRaises(TimeoutError):
+            wrapped()
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_delay_is_capped(self, mock_sleep):
+        """Test that the delay never exceeds max_delay."""
+        func = MagicMock(side_effect=[TimeoutError] * 3 + ["done"])
+        wrapped = retry(
+            TimeoutError, tries=5, delay=4, backoff=3, max_delay=10
+        )(func)
+        self.assertEqual(wrapped(), "done")
+        self.assertEqual(
+            [call.args[0] for call in mock_sleep.call_args_list], [4, 10, 10]
+        )
+
+
+class TestMapConcurrently(unittest.TestCase):
+    """Unit tests for map_concurrently."""
+
+    def test_keeps_order(self):
+        """Test that the results follow the order of the items."""
+        results = map_concurrently(lambda x: x * x, range(10), max_workers=3)
+        self.assertEqual(results, [x * x for x in range(10)])
+
+    @patch("optimizer.utils.web.add_script_run_ctx")
+    @patch("optimizer.utils.web.get_script_run_ctx", return_value="ctx")
+    def test_shares_script_run_context(self, _, mock_add_ctx):
+        """Test that the worker threads get the context of the caller."""
+        map_concurrently(str, [1, 2], max_workers=2)
+        for call in mock_add_ctx.call_args_list:
+            self.assertEqual(call.kwargs["ctx"], "ctx")
+        self.assertGreater(mock_add_ctx.call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,35 +10,13 @@ and uses JavaScript to copy the string to the clipboard when the button is \
 clicked.
 
 The returned value is a string containing the entire HTML code for the copy \
-button and textarea.
+button and textarea. The HTML is formatted from templates built once at \
+import, as each call only differs by its id, label, tips and text.
 """
 
 import uuid
-import re
 
-
-def copy_button(str_to_copy: str, label: str = "", tips: str = "") -> str:
-    """
-    Return an HTML string containing code for a copy button and hidden \
-    textarea.
-
-    The copy button copies the specified `str_to_copy` string to the \
-    clipboard on click. The `button_text` argument specifies the text to \
-    display on the copy button. The function generates HTML and CSS code for \
-    a button and a hidden textarea, and uses JavaScript to copy the string to \
-    the clipboard when the button is clicked.
-
-    Args:
-        str_to_copy (str): the string to be copied to the clipboard.
-        button_text (str): the text to display on the copy button.
-
-    Returns:
-        str: a string containing the entire HTML code for the copy button and \
-        textarea.
-    """
-    button_uuid = str(uuid.uuid4()).replace("-", "")
-    button_id = re.sub(r"\d+", "", button_uuid)
-    custom_css = f"""
+COPY_BUTTON_CSS = """
         <style>
             #btn_{button_id} {{
                 position: absolute;
@@ -69,20 +47,12 @@ def copy_button(str_to_copy: str, label: str = "", tips: str = "") -> str:
                 }}
         </style> """
 
-    if len(tips) > 0:
-        button_str = f"""
-                    <button title="{tips}" id="btn_{button_id}">{label}</button>
-                    """
-    else:
-        button_str = f"""
-            <button id="btn_{button_id}">{label}</button>
-            """
-    my_copy_button = f"""
-        {custom_css}
-        {button_str}
-        <textarea id="textarea_{button_id}" style="display:none;">{str_to_copy}</textarea>
+COPY_BUTTON_SCRIPT = """
+        <textarea id="textarea_{button_id}"
+            style="display:none;">{str_to_copy}</textarea>
         <script>
-            document.getElementById("btn_{button_id}").addEventListener("click", function() {{
+            document.getElementById("btn_{button_id}").addEventListener(
+                "click", function() {{
             const el = document.getElementById("textarea_{button_id}");
             el.style.display = "block";
             el.select();
@@ -92,4 +62,43 @@ def copy_button(str_to_copy: str, label: str = "", tips: str = "") -> str:
         </script>
     """
 
-    return my_copy_button
+# the whole HTML is formatted in one call, with or without a tooltip
+COPY_BUTTON_TEMPLATE = COPY_BUTTON_CSS + """
+            <button id="btn_{button_id}">{label}</button>
+            """ + COPY_BUTTON_SCRIPT
+
+COPY_BUTTON_TEMPLATE_TIPS = COPY_BUTTON_CSS + """
+                    <button title="{tips}"
+                        id="btn_{button_id}">{label}</button>
+                    """ + COPY_BUTTON_SCRIPT
+
+
+def copy_button(str_to_copy: str, label: str = "", tips: str = "") -> str:
+    """
+    Return an HTML string containing code for a copy button and hidden \
+    textarea.
+
+    The copy button copies the specified `str_to_copy` string to the \
+    clipboard on click. The `button_text` argument specifies the text to \
+    display on the copy button. The function generates HTML and CSS code for \
+    a button and a hidden textarea, and uses JavaScript to copy the string to \
+    the clipboard when the button is clicked.
+
+    Args:
+        str_to_copy (str): the string to be copied to the clipboard.
+        button_text (str): the text to display on the copy button.
+
+    Returns:
+        str: a string containing the entire HTML code for the copy button and \
+        textarea.
+    """
+    # the btn_ prefix keeps the selectors valid when the id starts with a
+    # digit
+    button_id = uuid.uuid4().hex
+    if len(tips) > 0:
+        template = COPY_BUTTON_TEMPLATE_TIPS
+    else:
+        template = COPY_BUTTON_TEMPLATE
+    return template.format(
+        button_id=button_id, label=label, tips=tips, str_to_copy=str_to_copy
+    )
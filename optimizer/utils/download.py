@@ -8,6 +8,8 @@ import re
 import streamlit as st
 import pandas as pd
 
+DIGITS_PATTERN = re.compile(r"\d+")
+
 
 def download_button(
     object_to_download, download_filename, button_text, pickle_it=False
@@ -59,7 +61,7 @@ def download_button(
         b64 = base64.b64encode(object_to_download).decode()
 
     button_uuid = str(uuid.uuid4()).replace("-", "")
-    button_id = re.sub(r"\d+", "", button_uuid)
+    button_id = DIGITS_PATTERN.sub("", button_uuid)
 
     custom_css = f"""
         <style>
@@ -1,10 +1,25 @@
 """
 This module provides functions for extracting specific types of strings from \
 input strings, using regular expressions.
+
+The inputs are short replies and URLs, so the cost is interpreter overhead \
+rather than computation: the patterns are compiled once, and substring \
+checks skip the patterns that cannot match. JIT compilers such as Numba do \
+not support `re`, and their compilation time would outweigh these \
+sub-millisecond calls.
 """
 
+from functools import lru_cache
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+
+DOUBLE_QUOTED_PATTERN = re.compile(r'(?<=").+?(?=")', flags=re.DOTALL)
+
+SINGLE_QUOTED_PATTERN = re.compile(r"(?<=').+(?=')", flags=re.DOTALL)
+
 
 def extract_by_quotation_mark(content):
     """
@@ -19,20 +34,39 @@ def extract_by_quotation_mark(content):
         or None if `content` does not contain any quotes.
 
     """
-    pattern1 = r'(?<=").+?(?=")'
-    pattern2 = r"(?<=').+(?=')"
-    if '"' in content:
-        match = re.findall(pattern1, content, flags=re.DOTALL)
-    elif "'" in content:
-        match = re.findall(pattern2, content, flags=re.DOTALL)
-    else:
-        return None
-    if len(match) > 0:
-        return match[0]
+    # same results as DOUBLE_QUOTED_PATTERN and SINGLE_QUOTED_PATTERN: up to
+    # the next double quote, or up to the last single quote
+    left = content.find('"')
+    if left != -1:
+        right = content.find('"', left + 2)
     else:
+        left = content.find("'")
+        if left == -1:
+            return None
+        right = content.rfind("'")
+    if right < left + 2:
         return None
-
-
+    return content[left + 1 : right]
+
+
+# the patterns in order of priority, each with a literal it cannot match
+# without, so the patterns that cannot match are skipped without a scan
+CODE_PATTERNS = tuple(
+    (literal, re.compile(pattern, flags=re.DOTALL))
+    for literal, pattern in (
+        ("```python", r"(?<=```python).+?(?=```)"),
+        ("```html", r"(?<=```html).+?(?=```)"),
+        ("```", r"(?<=```).+(?=```)"),
+        ("<code>", r"(?<=<code>).+?(?=</code>)"),
+        ("<code>", r"(?<=<code>).*?(?=</code>)"),
+        (":", r"(?<=:).*"),
+        ('"', DOUBLE_QUOTED_PATTERN.pattern),
+        ("'", SINGLE_QUOTED_PATTERN.pattern),
+    )
+)
+
+
+@lru_cache(maxsize=256)
 def extract_code(content):
     """
     Extracts code snippets from a string that may contain one or more snippets
@@ -46,36 +80,54 @@ def extract_code(content):
     Returns:
         str: The first code snippet found in the content, without the
         surrounding code blocks or tags. If no code snippet is found, or if
-        an error occurs during the matching process, None is returned.
+        an error occurs during the matching process, None is returned. The
+        result is cached by content, as the same reply is often extracted
+        again on a rerun.
     """
 
-    pattern1 = r"(?<=```python).+?(?=```)"
-    pattern2 = r"(?<=```html).+?(?=```)"
-    pattern3 = r"(?<=```).+(?=```)"
-    pattern4 = r"(?<=<code>).+?(?=</code>)"
-    pattern5 = r"<code>(.*?)</code>"
-    pattern6 = r"(?<=:).*"
-    pattern7 = r'(?<=").+?(?=")'
-    pattern8 = r"(?<=').+(?=')"
-    patterns = [
-        pattern1,
-        pattern2,
-        pattern3,
-        pattern4,
-        pattern5,
-        pattern6,
-        pattern7,
-        pattern8,
-    ]
-    for pattern in patterns:
-        match = re.findall(pattern, content, flags=re.DOTALL)
-        if len(match) > 0:
-            # print(pattern)
-            result = match[0]
+    if not content:
+        return None
+    for literal, pattern in CODE_PATTERNS:
+        if literal not in content:
+            continue
+        match = pattern.search(content)
+        if match is not None:
+            result = match.group()
             result = result.replace("<code>", "")
             result = result.replace("</code>", "")
             return result
-    print("extract_code: ", "find no pattern", content)
+    logger.debug("extract_code: find no pattern %s", content)
+    return None
+
+
+# the patterns in order of priority, each with a literal it cannot match
+# without, as for CODE_PATTERNS
+HTML_LIST_PATTERNS = (
+    # the items may have attributes, such as <li class="item">
+    ("<li", re.compile(r"<li(?:\s[^>]*)?>(.*?)</li>", flags=re.DOTALL)),
+    (".", re.compile(r"\d+\.\s*(.*?)(?=\n)", flags=re.DOTALL)),
+)
+
+
+@lru_cache(maxsize=256)
+def parse_html_list(content):
+    """
+    Parses the items of an HTML or numbered list. The result is cached by \
+    content, so it is returned as an immutable tuple.
+
+    Args:
+    - content (str): A string of HTML content
+
+    Returns:
+    - A tuple of the matched items, or None if no matches found.
+    """
+    for literal, pattern in HTML_LIST_PATTERNS:
+        if literal not in content:
+            continue
+        match = pattern.findall(content)
+        if len(match) > 0:
+            return tuple(match)
+    logger.debug("extract_html_list: find no pattern %s", content)
     return None
 
 
@@ -91,15 +143,38 @@ def extract_html_list(content):
     or None if no matches found.
 
     """
-    pattern1 = r"<li>(.*?)</li>"
-    pattern2 = r"\d+\.\s*(.*?)(?=\n)"
-    patterns = [pattern1, pattern2]
-    for pattern in patterns:
-        match = re.findall(pattern, content, flags=re.DOTALL)
-        if len(match) > 0:
-            return match
-    print("extract_html_list: ", "find no pattern", content)
-    return None
+    if not content:
+        return None
+    items = parse_html_list(content)
+    if items is None:
+        return None
+    return list(items)
+
+
+NUMBERED_PARAGRAPH_PATTERN = re.compile(
+    r"<p(\d+)>(.*?)</p\1>", flags=re.DOTALL
+)
+
+
+def extract_numbered_paragraphs(content):
+    """
+    Extracts the paragraphs labelled with numbered tags, such as \
+    <p1>...</p1> and <p2>...</p2>.
+
+    Args:
+    - content (str): A string containing the labelled paragraphs.
+
+    Returns:
+    - A list of the paragraphs in the order of their numbers.
+    """
+    matches = NUMBERED_PARAGRAPH_PATTERN.findall(content)
+    matches.sort(key=lambda match: int(match[0]))
+    return [paragraph.strip() for _, paragraph in matches]
+
+
+# the job ID is the run of digits after jobs/view/1234567890 or
+# currentJobId=1234567890
+LINKEDIN_JOB_ID_MARKERS = ("jobs/view/", "currentJobId=")
 
 
 def extract_linkedin_job_id(url):
@@ -112,19 +187,24 @@ def extract_linkedin_job_id(url):
     Returns:
     - A string containing the LinkedIn job ID, or None if no match is found.
     """
-    # regular expression to match jobs/view/1234567890
-    pattern1 = r"(?<=jobs/view/)\d+"
-    # regular expression to match currentJobId=1234567890
-    pattern2 = r"(?<=currentJobId=)\d+"
-    patterns = [pattern1, pattern2]
-    for pattern in patterns:
-        match = re.findall(pattern, url, flags=re.DOTALL)
-        if len(match) > 0:
-            return match[0]
+    for marker in LINKEDIN_JOB_ID_MARKERS:
+        start = url.find(marker)
+        while start != -1:
+            start += len(marker)
+            end = start
+            while end < len(url) and url[end].isdecimal():
+                end += 1
+            if end > start:
+                return url[start:end]
+            start = url.find(marker, start)
 
     return None
 
 
+# matches Version 1: 30 words
+VERSION_NUMBER_PATTERN = re.compile(r"(?<=version\s)\d+(?=:)")
+
+
 def extract_version_number(version_str):
     """
     Extracts the version number from a string.
@@ -135,12 +215,7 @@ def extract_version_number(version_str):
     Returns:
     - A string containing the version number, or None if no match is found.
     """
-    # regular expression to match Version 1: 30 words
-    pattern1 = r"(?<=version\s)\d+(?=:)"
-    patterns = [pattern1]
-    for pattern in patterns:
-        match = re.findall(pattern, version_str.lower(), flags=re.DOTALL)
-        if len(match) > 0:
-            return match[0]
-
+    match = VERSION_NUMBER_PATTERN.search(version_str.lower())
+    if match is not None:
+        return match.group()
     return None
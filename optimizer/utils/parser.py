@@ -14,11 +14,13 @@ import requests
 import streamlit as st
 from optimizer.gpt.query import (
     analyse_resume,
+    get_digest,
     query_project_contributions,
     query_project_description,
     query_project_title,
 )
 from optimizer.utils.extract import extract_by_quotation_mark
+from optimizer.utils.web import map_concurrently
 
 
 def snake_case(arg: str, delimiter: str, upper_case: bool) -> str:
@@ -340,9 +342,11 @@ def parse_experience(exp_in: dict) -> dict:
         project = parse_project(copy.deepcopy(exp_in))
         exp_out["projects"] = [project]
     else:
-        for i in range(len(exp_out["projects"])):
-            project_old = copy.deepcopy(exp_out["projects"][i])
-            exp_out["projects"][i] = parse_project(project_old)
+        # projects are independent, so their GPT queries run concurrently
+        exp_out["projects"] = map_concurrently(
+            parse_project,
+            [copy.deepcopy(project) for project in exp_out["projects"]],
+        )
 
     return exp_out
 
@@ -431,7 +435,12 @@ def parse_resume(txt_resume: str) -> None:
     try:
         parse_json(txt_resume)
     except ValueError:
-        reply_json = analyse_resume(txt_resume, temperature=0.1)
+        reply_json = analyse_resume(
+            get_digest(txt_resume),
+            txt_resume,
+            temperature=0.1,
+            model=st.session_state["MODEL"],
+        )
         parse_api_json(reply_json)
     except Exception as error:
         print(f"Error: {str(error)}")
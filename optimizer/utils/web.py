@@ -1,8 +1,13 @@
 """Web utilities."""
+from concurrent.futures import ThreadPoolExecutor
 import time
 from functools import wraps
 import urllib.parse
 import streamlit as st
+from streamlit.runtime.scriptrunner import (
+    add_script_run_ctx,
+    get_script_run_ctx,
+)
 
 
 def retry(exception, tries=5, delay=1, backoff=2, max_delay=120):
@@ -26,16 +31,19 @@ def retry(exception, tries=5, delay=1, backoff=2, max_delay=120):
         @wraps(func)
         def f_retry(*args, **kwargs):
             m_delay = delay
-            num_tries = tries
-            while tries > 1:
+            placeholder = None
+            for _ in range(tries - 1):
                 try:
                     return func(*args, **kwargs)
                 except exception as error:
-                    with st.empty():
-                        st.write(f"{error}, Retrying in {m_delay} seconds...")
-                        time.sleep(m_delay)
-                        st.write("")
-                    num_tries -= 1
+                    # reuse a single placeholder for all retry messages
+                    if placeholder is None:
+                        placeholder = st.empty()
+                    placeholder.write(
+                        f"{error}, Retrying in {m_delay} seconds..."
+                    )
+                    time.sleep(m_delay)
+                    placeholder.empty()
                     m_delay = min(m_delay * backoff, max_delay)
             # last attempt
             return func(*args, **kwargs)
@@ -45,6 +53,34 @@ def retry(exception, tries=5, delay=1, backoff=2, max_delay=120):
     return deco_retry
 
 
+def map_concurrently(func, items, max_workers=4):
+    """
+    Applies a function to each item in worker threads and returns the \
+    results in the order of the items. The threads share the script run \
+    context of the caller, so the function can still use the session state \
+    and write to the page.
+
+    Args:
+        func (function): The function to apply, usually one waiting on a \
+            network request.
+        items (list): The items to pass to the function.
+        max_workers (int, optional): The maximum number of threads. \
+            Defaults to 4.
+
+    Returns:
+        list: The results of the function for each item.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items)),
+        initializer=lambda: add_script_run_ctx(ctx=ctx),
+    ) as executor:
+        return list(executor.map(func, items))
+
+
 def is_valid_url(url):
     try:
         result = urllib.parse.urlparse(url)
@@ -4,7 +4,11 @@ by calling the OpenAI GPT API.
 """
 import streamlit as st
 from optimizer.core.initialisation import initialise, get_layout
-from optimizer.gpt.query import get_company_role, summary_job_description
+from optimizer.gpt.query import (
+    get_company_role,
+    get_digest,
+    summary_job_description,
+)
 from optimizer.proxycurl.query import scrap_job_description
 from optimizer.utils.web import is_valid_url
 
@@ -49,13 +53,17 @@ def job_description():
                     st.error("The URL is not valid. Please try again.")
                     st.stop()
 
-            job_analysed = summary_job_description(st.session_state["txt_jd"])
+            txt_jd = st.session_state["txt_jd"]
+            jd_digest = get_digest(txt_jd)
+            job_analysed = summary_job_description(
+                jd_digest, txt_jd, st.session_state["MODEL"]
+            )
 
             if job_analysed is not None:
                 st.session_state["job_analysed"] = job_analysed
 
             st.session_state["company_role"] = get_company_role(
-                st.session_state["txt_jd"]
+                jd_digest, txt_jd
             )
 
     if st.session_state["company_role"] != "":
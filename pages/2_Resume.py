@@ -8,7 +8,7 @@ import streamlit as st
 from st_dropfill_textarea import st_dropfill_textarea
 from optimizer.core.initialisation import initialise, get_layout
 from optimizer.core.resume import get_parsed_resume
-from optimizer.gpt.query import estimate_match_rate
+from optimizer.gpt.query import estimate_match_rate, get_digest
 from optimizer.utils.parser import parse_resume
 from optimizer.io.docx_file import docx_to_text
 from streamlit_extras.switch_page_button import switch_page
@@ -119,8 +119,14 @@ def upload_resume():
         show_debug_info()
     if st.session_state["btn_estimate"]:
         with st.spinner("Estimating the match rate ..."):
+            txt_jd = st.session_state["txt_jd"]
+            txt_resume = st.session_state["txt_resume"]
             reply = estimate_match_rate(
-                st.session_state["txt_jd"], st.session_state["txt_resume"]
+                get_digest(txt_jd),
+                get_digest(txt_resume),
+                txt_jd,
+                txt_resume,
+                st.session_state["MODEL"],
             )
             st.markdown(
                 "### Can you help me estimate the match rate between \
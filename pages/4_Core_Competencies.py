@@ -5,7 +5,7 @@ This page provides the functions for generating and sorting skills for a job des
 import copy
 import streamlit as st
 from optimizer.core.initialisation import initialise, get_layout
-from optimizer.gpt.query import generate_skills, sort_skills
+from optimizer.gpt.query import generate_skills, get_digest, sort_skills
 from optimizer.utils.extract import extract_code
 from optimizer.utils.parser import parse_skills_string, reset_skills
 
@@ -293,6 +293,7 @@ def edit_skills():
                 st.session_state["btn_sort_skills"] = True
                 with st.spinner("Sorting"):
                     reply = sort_skills(
+                        get_digest(st.session_state["txt_jd"]),
                         st.session_state["txt_jd"],
                         st.session_state["skills"],
                         skills_temp,
@@ -73,9 +73,12 @@ def edit_description(project: dict) -> None:
 
     """
     name = project["uuid"]
-    project["description"] = st.text_area(
+    description = st.text_area(
         "Description", project["description"], height=200
     )
+    if description != project["description"]:
+        project["description"] = description
+        st.session_state["experiences_version"] += 1
 
     col_description_words, col_description_temp, col_description = st.columns(
         [1, 1, 1]
@@ -273,7 +276,10 @@ def edit_project(project: dict) -> None:
         None. The function updates the project dictionary in place.
     """
     init_project(project)
-    project["title"] = st.text_input("Project:", project["title"])
+    title = st.text_input("Project:", project["title"])
+    if title != project["title"]:
+        project["title"] = title
+        st.session_state["experiences_version"] += 1
     edit_description(project)
     edit_contribtions(project)
 
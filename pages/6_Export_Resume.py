@@ -13,7 +13,7 @@ from optimizer.core.resume import (
     choose_statement,
     get_chosen_experiences,
 )
-from optimizer.gpt.query import get_company_role
+from optimizer.gpt.query import get_company_role, get_digest
 from optimizer.io.docx_file import to_docx, validate_template
 from optimizer.utils.download import download_button
 
@@ -40,8 +40,9 @@ def write_docx():
     """
 
     if st.session_state["company_role"] == "":
+        txt_jd = st.session_state["txt_jd"]
         st.session_state["company_role"] = get_company_role(
-            st.session_state["txt_jd"]
+            get_digest(txt_jd), txt_jd
         )
     statement = choose_statement()
     skills = choose_skills()
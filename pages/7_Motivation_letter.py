@@ -10,7 +10,7 @@ from st_dropfill_textarea import st_dropfill_textarea
 from optimizer.core.initialisation import initialise, get_layout
 from optimizer.core.resume import count_words
 from optimizer.gpt.query import (
-    create_motivation,
+    create_motivations,
     generate_motivations,
     revise_motivation,
     revise_motivations,
@@ -269,9 +269,20 @@ def edit_motivations() -> None:
                 if st.button(
                     "Generate",
                     key="generate_motivation_" + motivation["uuid"],
-                    help="Generate a paragraph based on previous letter",
+                    help="Generate this and the following empty paragraphs \
+                        based on previous letter",
                 ):
-                    motivation["content"] = create_motivation(index, config)
+                    # fill the whole run of empty paragraphs in one request
+                    empties = []
+                    for following in st.session_state["motivations"][index:]:
+                        if len(following["content"]) != 0:
+                            break
+                        empties.append(following)
+                    paragraphs = create_motivations(
+                        index, len(empties), config
+                    )
+                    for empty, paragraph in zip(empties, paragraphs):
+                        empty["content"] = paragraph
                     st.experimental_rerun()
                 if st.button(
                     "Delete",
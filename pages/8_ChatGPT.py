@@ -4,7 +4,6 @@ based on selected background information
 """
 
 import copy
-import uuid
 from st_dropfill_textarea import st_dropfill_textarea
 import streamlit as st
 import streamlit.components.v1 as components
@@ -12,11 +11,12 @@ from optimizer.core.initialisation import initialise, get_layout
 from optimizer.gpt.api import (
     get_model_names,
     get_model_index_by_name,
-    SYSTEM_ROLE,
 )
+from optimizer.gpt.prompts import SYSTEM_ROLE
 from optimizer.gpt.query import (
     get_experiences_msg,
     get_job_description_msg,
+    get_message_id,
     get_skills_msg,
     get_system_msg,
     query_gpt,
@@ -318,7 +318,7 @@ def append_input() -> None:
         if submitted and len(new_msg) > 0:
             st.session_state["messages"] += [
                 {
-                    "id": str(uuid.uuid4()),
+                    "id": get_message_id(),
                     "select": True,
                     "type": "input",
                     "role": "user",
@@ -393,7 +393,7 @@ def insert_messages():
         if insertted and role is not None and len(new_msg) > 0:
             st.session_state["messages"] += [
                 {
-                    "id": str(uuid.uuid4()),
+                    "id": get_message_id(),
                     "select": True,
                     "type": message_types[role],
                     "role": role,